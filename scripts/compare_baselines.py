@@ -6,11 +6,55 @@ from pathlib import Path
 from typing import Dict
 import csv
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to a per-endpoint loop
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; fall back to csv.DictReader
+    pd = None
+
 REGRESSION_THRESHOLD_PCT = 10.0  # 10% regression threshold
 
 
 def parse_locust_csv(stats_csv: Path) -> Dict[str, Dict[str, float]]:
     """Parse Locust CSV and return metrics dict."""
+    if pd is None:
+        return _parse_locust_csv_rows(stats_csv)
+
+    try:
+        df = pd.read_csv(stats_csv, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        return {}
+    if 'Name' not in df:
+        return {}
+    df = df[df['Name'].ne('Aggregated') & df['Name'].ne('')]
+    if df.empty:
+        return {}
+
+    def column(*names: str, default: str = '0'):
+        for name in names:
+            if name in df:
+                return df[name]
+        return pd.Series(default, index=df.index)
+
+    types = column('Type', default='GET')
+    out = pd.DataFrame({
+        'count': pd.to_numeric(column('Request Count', '# Requests', 'Count')).astype('int64'),
+        'avg_ms': pd.to_numeric(column('Average Response Time', 'Average')).astype('float64'),
+        'p95_ms': pd.to_numeric(column('95%')).astype('float64'),
+        'failure_rate': pd.to_numeric(column('Failure Rate').str.rstrip('%')).astype('float64'),
+    })
+    out.index = df['Name'] + ' (' + types + ')'
+    # Like the dict fallback: first-seen order, last row's values
+    out = out.groupby(level=0, sort=False).last()
+    return out.to_dict('index')
+
+
+def _parse_locust_csv_rows(stats_csv: Path) -> Dict[str, Dict[str, float]]:
+    """Row-by-row fallback for parse_locust_csv when pandas is unavailable."""
     metrics = {}
     with open(stats_csv) as f:
         reader = csv.DictReader(f)
@@ -45,6 +89,43 @@ def save_baseline(metrics: Dict, baseline_path: Path):
 
 def detect_regressions(current: Dict, baseline: Dict) -> list:
     """Detect performance regressions."""
+    if np is None:
+        return _detect_regressions_loop(current, baseline)
+
+    endpoints = [e for e in current if e in baseline]
+    if not endpoints:
+        return []
+
+    def column(metrics: Dict, key: str):
+        return np.fromiter((metrics[e][key] for e in endpoints), dtype=np.float64, count=len(endpoints))
+
+    curr_p95, base_p95 = column(current, 'p95_ms'), column(baseline, 'p95_ms')
+    curr_fail, base_fail = column(current, 'failure_rate'), column(baseline, 'failure_rate')
+
+    p95_change = (curr_p95 - base_p95) / np.where(base_p95 > 0, base_p95, 1.0) * 100
+    p95_flag = (base_p95 > 0) & (p95_change > REGRESSION_THRESHOLD_PCT)
+    fail_increase = curr_fail - base_fail
+    fail_flag = fail_increase > 0.5  # 0.5% increase
+
+    # Only flagged endpoints pay for string formatting
+    regressions = []
+    for i in np.flatnonzero(p95_flag | fail_flag):
+        endpoint = endpoints[i]
+        if p95_flag[i]:
+            regressions.append(
+                f"{endpoint}: p95 increased by {p95_change[i]:.1f}% "
+                f"({base_p95[i]:.2f}ms → {curr_p95[i]:.2f}ms)"
+            )
+        if fail_flag[i]:
+            regressions.append(
+                f"{endpoint}: failure rate increased by {fail_increase[i]:.1f}% "
+                f"({base_fail[i]:.1f}% → {curr_fail[i]:.1f}%)"
+            )
+    return regressions
+
+
+def _detect_regressions_loop(current: Dict, baseline: Dict) -> list:
+    """Per-endpoint fallback for detect_regressions when numpy is unavailable."""
     regressions = []
     for endpoint, curr_metrics in current.items():
         if endpoint not in baseline:
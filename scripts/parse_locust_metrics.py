@@ -4,7 +4,12 @@ import csv
 import sys
 import os
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; fall back to csv.DictReader
+    pd = None
 
 # SLO thresholds (configurable via env)
 P95_THRESHOLD_MS = float(os.getenv("SLO_P95_MS", "150"))
@@ -13,6 +18,38 @@ FAILURE_THRESHOLD_PCT = float(os.getenv("SLO_FAILURE_PCT", "1.0"))
 
 def parse_stats(stats_csv: Path) -> Dict[str, Dict[str, float]]:
     """Parse locust_stats.csv and return endpoint metrics."""
+    if pd is None:
+        return _parse_stats_csv(stats_csv)
+
+    try:
+        df = pd.read_csv(stats_csv, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        return {}
+    if df.empty:
+        return {}
+
+    def column(name: str):
+        if name not in df:
+            return pd.Series(0.0, index=df.index)
+        return pd.to_numeric(df[name])
+
+    out = pd.DataFrame({
+        'count': column('Count').astype('int64'),
+        'avg_ms': column('Average') / 1000.0,  # Convert from ms to s then back
+        'min_ms': column('Min') / 1000.0,
+        'max_ms': column('Max') / 1000.0,
+        'median_ms': column('Median') / 1000.0,
+        'p95_ms': column('95%') / 1000.0,
+        'failure_rate': column('Failure Rate').astype('float64'),
+    })
+    out.index = df['Name'] + ' (' + df['Type'] + ')' if 'Type' in df else df['Name']
+    # Like the dict fallback: first-seen order, last row's values
+    out = out.groupby(level=0, sort=False).last()
+    return out.to_dict('index')
+
+
+def _parse_stats_csv(stats_csv: Path) -> Dict[str, Dict[str, float]]:
+    """Row-by-row fallback for parse_stats when pandas is unavailable."""
     metrics: Dict[str, Dict[str, float]] = {}
     with open(stats_csv) as f:
         reader = csv.DictReader(f)
@@ -41,18 +78,26 @@ def check_slos(metrics: Dict[str, Dict[str, float]]) -> List[str]:
     return violations
 
 
-def format_report(metrics: Dict[str, Dict[str, float]]) -> str:
-    """Format metrics as markdown table."""
-    lines = [
-        "| Endpoint | Count | Avg (ms) | Median (ms) | p95 (ms) | Max (ms) | Fail % |",
-        "|----------|-------|---------|------------|---------|---------|--------|",
-    ]
+REPORT_HEADER = (
+    "| Endpoint | Count | Avg (ms) | Median (ms) | p95 (ms) | Max (ms) | Fail % |",
+    "|----------|-------|---------|------------|---------|---------|--------|",
+)
+ROW_FMT = "| {} | {} | {:.2f} | {:.2f} | {:.2f} | {:.2f} | {:.1f} |".format
+
+
+def iter_report_lines(metrics: Dict[str, Dict[str, float]]) -> Iterator[str]:
+    """Yield the markdown table lines for metrics, header first."""
+    yield from REPORT_HEADER
     for endpoint, m in metrics.items():
-        lines.append(
-            f"| {endpoint} | {m['count']} | {m['avg_ms']:.2f} | {m['median_ms']:.2f} | "
-            f"{m['p95_ms']:.2f} | {m['max_ms']:.2f} | {m['failure_rate']:.1f} |"
+        yield ROW_FMT(
+            endpoint, m['count'], m['avg_ms'], m['median_ms'],
+            m['p95_ms'], m['max_ms'], m['failure_rate'],
         )
-    return "\n".join(lines)
+
+
+def format_report(metrics: Dict[str, Dict[str, float]]) -> str:
+    """Format metrics as markdown table."""
+    return "\n".join(iter_report_lines(metrics))
 
 
 def main():
@@ -62,8 +107,8 @@ def main():
         sys.exit(1)
     
     metrics = parse_stats(stats_csv)
-    report = format_report(metrics)
-    print(report)
+    # Stream rows straight to stdout instead of joining one large string
+    sys.stdout.writelines(line + "\n" for line in iter_report_lines(metrics))
     
     # Check SLOs
     violations = check_slos(metrics)
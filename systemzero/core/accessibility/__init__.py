@@ -3,5 +3,6 @@ from .listener import AccessibilityListener
 from .tree_capture import TreeCapture
 from .event_stream import EventStream
 from .permissions import PermissionManager
+from .ui_event import UIEvent
 
-__all__ = ["AccessibilityListener","TreeCapture","EventStream","PermissionManager"]
+__all__ = ["AccessibilityListener","TreeCapture","EventStream","PermissionManager","UIEvent"]
@@ -1,39 +1,140 @@
 """Event stream for accessibility events."""
-from collections import deque
-from typing import Any, Optional
+from itertools import count as _counter
+from typing import Any, List, Optional
+import logging
 import threading
 
+from core.utils import LogThrottle
+
+logger = logging.getLogger(__name__)
+_error_throttle = LogThrottle()
+
+
+class _RingBuffer:
+    """Fixed-capacity ring buffer with monotonically increasing indices.
+
+    Slots are sized to the next power of two above ``maxlen`` so positions
+    wrap with a mask and one slot always stays spare. Producers claim a
+    sequence number from a C-level counter (atomic under the GIL) and stamp
+    it into the slot, so bounded buffers need no lock at all; readers never
+    block and skip any slot whose stamp does not match the index they expect.
+    Unbounded buffers (``maxlen=None``) serialize producers so they can grow.
+    """
+
+    __slots__ = ("_buf", "_mask", "_maxlen", "_seq", "_head", "_tail", "_grow_lock")
+
+    def __init__(self, maxlen: Optional[int]):
+        self._maxlen = maxlen
+        capacity = 1
+        while capacity <= (maxlen or 64):
+            capacity <<= 1
+        self._buf: List[Any] = [None] * capacity
+        self._mask = capacity - 1
+        self._seq = _counter()
+        self._head = 0  # one past the newest published sequence number
+        self._tail = 0  # oldest sequence number still visible
+        self._grow_lock = threading.Lock() if maxlen is None else None
+
+    def __len__(self) -> int:
+        size = self._head - self._tail
+        return size if self._maxlen is None else min(size, self._maxlen)
+
+    def append(self, item: Any) -> None:
+        if self._grow_lock is None:
+            self._store(item)
+            return
+        with self._grow_lock:
+            if self._head - self._tail >= self._mask:
+                self._grow()
+            self._store(item)
+
+    def snapshot(self, count: int) -> List[Any]:
+        """Return up to ``count`` most recent items, oldest first."""
+        if count <= 0:
+            return []
+        buf, mask = self._buf, self._mask
+        head = self._head
+        # head is only a hint; pick up slots published past it
+        while True:
+            slot = buf[head & mask]
+            if slot is None or slot[0] != head:
+                break
+            head += 1
+        start = max(self._tail, head - count)
+        if self._maxlen is not None:
+            start = max(start, head - self._maxlen)
+        if start >= head:
+            return []
+        # Copy just the window with at most two C-level slices; the window
+        # never spans the whole buffer because one slot is always spare
+        lo, hi = start & mask, head & mask
+        window = buf[lo:hi] if lo < hi else buf[lo:] + buf[:hi]
+        # Skip slots that are unwritten or recycled by a concurrent producer
+        return [
+            slot[1] for seq, slot in enumerate(window, start)
+            if slot is not None and slot[0] == seq
+        ]
+
+    def clear(self) -> None:
+        self._tail = self._head
+        self._buf = [None] * len(self._buf)
+
+    def _store(self, item: Any) -> None:
+        seq = next(self._seq)
+        self._buf[seq & self._mask] = (seq, item)
+        # Racing producers may publish out of order; readers probe past a
+        # stale head so nothing is hidden.
+        if seq >= self._head:
+            self._head = seq + 1
+
+    def _grow(self) -> None:
+        buf = [None] * (len(self._buf) * 2)
+        mask = len(buf) - 1
+        for slot in self._buf:
+            if slot is not None and slot[0] >= self._tail:
+                buf[slot[0] & mask] = slot
+        self._buf = buf
+        self._mask = mask
+
 
 class EventStream:
-    """Thread-safe event stream for UI accessibility events."""
-    
+    """Thread-safe event stream for UI accessibility events.
+
+    Events are stored in a ring buffer that bounded streams append to
+    without locking. Listeners are dispatched from a tuple snapshot taken
+    at subscribe time and readers never block producers.
+    """
+
     def __init__(self, maxlen: Optional[int] = 1000):
-        self._events = deque(maxlen=maxlen)
+        self._events = _RingBuffer(maxlen)
         self._lock = threading.Lock()
-        self._listeners = []
-    
+        self._listeners: tuple = ()
+
     def push(self, event: Any) -> None:
         """Add an event to the stream."""
-        with self._lock:
-            self._events.append(event)
-            # Notify listeners
-            for listener in self._listeners:
-                try:
-                    listener(event)
-                except Exception as e:
-                    print(f"EventStream listener error: {e}")
-    
+        self._events.append(event)
+        # Listeners are copy-on-write, so this iterates an immutable
+        # snapshot even if a callback subscribes mid-dispatch
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                if _error_throttle.allow(("listener", str(e))):
+                    logger.warning("EventStream listener error: %s", e)
+
     def subscribe(self, callback) -> None:
-        """Subscribe a callback to receive events."""
+        """Subscribe a callback to receive events.
+
+        The listener tuple is replaced rather than mutated; the lock only
+        serializes concurrent subscribers and is never held by ``push``.
+        """
         with self._lock:
-            self._listeners.append(callback)
-    
+            self._listeners = self._listeners + (callback,)
+
     def get_recent(self, count: int = 10) -> list:
         """Get the most recent N events."""
-        with self._lock:
-            return list(self._events)[-count:]
-    
+        return self._events.snapshot(count)
+
     def clear(self) -> None:
         """Clear all events from the stream."""
-        with self._lock:
-            self._events.clear()
+        self._events.clear()
@@ -1,8 +1,15 @@
 """Accessibility event listener for UI changes."""
+import logging
 import threading
 import time
 from typing import Optional, Callable
 
+from core.utils import LogThrottle
+from .ui_event import UIEvent
+
+logger = logging.getLogger(__name__)
+_error_throttle = LogThrottle()
+
 
 class AccessibilityListener:
     """Listens for accessibility events and forwards them to an event stream.
@@ -14,6 +21,14 @@ class AccessibilityListener:
     - Layout modifications
     """
     
+    # Payload shared by every mock poll event; a plain dict so events stay
+    # JSON-serializable, and callers must treat it as read-only
+    _MOCK_EVENT = {
+        "type": "window_focus",
+        "source": "accessibility_api",
+        "window_title": "Mock Application"
+    }
+    
     def __init__(self, event_stream, poll_interval: float = 0.5):
         self.event_stream = event_stream
         self.poll_interval = poll_interval
@@ -36,19 +51,21 @@ class AccessibilityListener:
         if self._thread:
             self._thread.join(timeout=2.0)
     
-    def on_event(self, raw_event: dict) -> None:
+    def on_event(self, raw_event: dict, *, now: Optional[float] = None) -> None:
         """Process and forward a raw accessibility event.
         
         Args:
             raw_event: Raw event data from accessibility API
+            now: Timestamp to stamp the event with; callers handling a
+                batch of events can read the clock once and pass it in
         """
         # Enrich event with metadata
-        enriched_event = {
-            "type": raw_event.get("type", "unknown"),
-            "timestamp": time.time(),
-            "source": raw_event.get("source", "accessibility_api"),
-            "data": raw_event
-        }
+        enriched_event = UIEvent(
+            raw_event.get("type", "unknown"),
+            time.time() if now is None else now,
+            raw_event.get("source", "accessibility_api"),
+            raw_event,
+        )
         
         # Push to event stream
         self.event_stream.push(enriched_event)
@@ -58,7 +75,8 @@ class AccessibilityListener:
             try:
                 self._on_event_callback(enriched_event)
             except Exception as e:
-                print(f"Event callback error: {e}")
+                if _error_throttle.allow(("callback", str(e))):
+                    logger.warning("Event callback error: %s", e)
     
     def set_callback(self, callback: Callable) -> None:
         """Register a callback to be called on each event."""
@@ -74,14 +92,12 @@ class AccessibilityListener:
             try:
                 # Mock event generation
                 # Real implementation would poll/listen to OS accessibility events
-                mock_event = {
-                    "type": "window_focus",
-                    "source": "accessibility_api",
-                    "window_title": "Mock Application"
-                }
-                self.on_event(mock_event)
+                # One clock read per poll cycle, shared by the whole batch
+                now = time.time()
+                self.on_event(self._MOCK_EVENT, now=now)
                 
                 time.sleep(self.poll_interval)
             except Exception as e:
-                print(f"Listener loop error: {e}")
+                if _error_throttle.allow(("loop", str(e))):
+                    logger.warning("Listener loop error: %s", e)
                 time.sleep(1.0)
@@ -1,8 +1,22 @@
 """UI tree capture from accessibility APIs."""
+import functools
 import platform
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import time
 
+_ROLES = ("window", "pane", "scroll_pane", "button", "text_field", "label")
+
+
+@functools.lru_cache(maxsize=None)
+def _node_fields(depth: int) -> Tuple[str, str, str, Tuple[int, int, int, int]]:
+    """Per-depth immutable node fields: type, role, name and flat bounds."""
+    return (
+        "container" if depth < 2 else "element",
+        _ROLES[min(depth, len(_ROLES) - 1)],
+        f"Element_{depth}",
+        (depth * 10, depth * 10, 100 - (depth * 10), 50 - (depth * 5)),
+    )
+
 
 class TreeCapture:
     """Captures UI element trees from system accessibility APIs.
@@ -37,7 +51,7 @@ class TreeCapture:
             "timestamp": self._last_capture_time,
             "platform": self.platform,
             "active_window": self._get_active_window(),
-            "root": self._capture_tree_recursive()
+            "root": self._capture_tree()
         }
     
     def _get_active_window(self) -> Dict[str, Any]:
@@ -49,43 +63,43 @@ class TreeCapture:
             "pid": 12345
         }
     
-    def _capture_tree_recursive(self, depth: int = 0, max_depth: int = 5) -> Dict[str, Any]:
-        """Recursively capture UI tree structure.
+    def _capture_tree(self, depth: int = 0, max_depth: int = 5) -> Optional[Dict[str, Any]]:
+        """Capture UI tree structure.
         
         Returns a mock tree structure. Real implementation would
-        traverse actual accessibility tree.
+        traverse actual accessibility tree. Built iteratively with an
+        explicit stack; children are attached in order as they are created.
         """
         if depth >= max_depth:
             return None
         
-        node = {
-            "type": "container" if depth < 2 else "element",
-            "role": self._get_mock_role(depth),
-            "name": f"Element_{depth}",
+        root = self._make_node(depth)
+        stack = [(root, depth)]
+        while stack:
+            node, level = stack.pop()
+            # Add mock children
+            if level >= 3 or level + 1 >= max_depth:
+                continue
+            children = node["children"]
+            for _ in range(2):
+                child = self._make_node(level + 1)
+                children.append(child)
+                stack.append((child, level + 1))
+        
+        return root
+    
+    def _make_node(self, depth: int) -> Dict[str, Any]:
+        """Build a single mock node for the given depth."""
+        node_type, role, name, (x, y, width, height) = _node_fields(depth)
+        return {
+            "type": node_type,
+            "role": role,
+            "name": name,
             "properties": {
                 "visible": True,
                 "enabled": True,
                 "focused": depth == 0
             },
-            "bounds": {
-                "x": depth * 10,
-                "y": depth * 10,
-                "width": 100 - (depth * 10),
-                "height": 50 - (depth * 5)
-            },
+            "bounds": {"x": x, "y": y, "width": width, "height": height},
             "children": []
         }
-        
-        # Add mock children
-        if depth < 3:
-            for i in range(2):
-                child = self._capture_tree_recursive(depth + 1, max_depth)
-                if child:
-                    node["children"].append(child)
-        
-        return node
-    
-    def _get_mock_role(self, depth: int) -> str:
-        """Return mock accessibility roles."""
-        roles = ["window", "pane", "scroll_pane", "button", "text_field", "label"]
-        return roles[min(depth, len(roles) - 1)]
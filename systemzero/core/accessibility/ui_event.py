@@ -0,0 +1,49 @@
+"""Enriched accessibility event record."""
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping
+
+_FIELDS = frozenset({"type", "timestamp", "source", "data"})
+
+
+@dataclass(slots=True, frozen=True)
+class UIEvent:
+    """Single accessibility event as pushed onto an EventStream.
+
+    Slotted and immutable, so each event is a fixed-size record rather than
+    a per-event hash table. Supports ``event["field"]``, ``event.get()``
+    and ``"field" in event`` for callers written against the previous
+    dict events.
+
+    Attributes:
+        type: Event type reported by the accessibility API
+        timestamp: Time the event was received (epoch seconds)
+        source: Originating API
+        data: Raw event payload
+    """
+    type: str
+    timestamp: float
+    source: str
+    data: Mapping[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELDS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field by name, or ``default`` if there is no such field."""
+        if key not in _FIELDS:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the plain dict form; ``data`` is copied into a dict."""
+        return {
+            "type": self.type,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "data": dict(self.data),
+        }
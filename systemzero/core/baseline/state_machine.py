@@ -1,17 +1,27 @@
 """State machine for managing UI state transitions."""
-from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Dict, Any, Optional, Tuple
+
+DEFAULT_HISTORY_LIMIT = 10_000
 
 
 class StateMachine:
     """Manages UI state transitions and validates state flows.
     
     Tracks state history and validates transitions against template definitions.
+    History is bounded (oldest transitions are dropped) so long-running
+    processes keep constant memory.
     """
     
-    def __init__(self):
-        """Initialize state machine."""
+    def __init__(self, history_limit: int = DEFAULT_HISTORY_LIMIT):
+        """Initialize state machine.
+        
+        Args:
+            history_limit: Maximum number of transitions kept in history
+        """
         self.current_state: Optional[str] = None
-        self.state_history: List[Tuple[str, str]] = []
+        self.state_history: Deque[Tuple[str, str]] = deque(maxlen=history_limit)
     
     def transition(self, from_id: str, to_id: str) -> None:
         """Record a state transition.
@@ -54,12 +64,21 @@ class StateMachine:
         Returns:
             List of (from_id, to_id) tuples
         """
-        return self.state_history[-count:]
+        size = len(self.state_history)
+        return list(islice(self.state_history, max(0, size - count), size))
+    
+    def set_history_limit(self, limit: int) -> None:
+        """Change the maximum history length, keeping the newest entries.
+        
+        Args:
+            limit: Maximum number of transitions kept in history
+        """
+        self.state_history = deque(self.state_history, maxlen=limit)
     
     def reset(self) -> None:
         """Reset state machine to initial state."""
         self.current_state = None
-        self.state_history = []
+        self.state_history.clear()
     
     # Alias for compatibility
     @property
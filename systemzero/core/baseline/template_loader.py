@@ -1,9 +1,76 @@
 """Load and manage YAML baseline templates."""
+import copy
+import functools
+import json
+import logging
 import yaml
 import os
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Below this many files a thread pool costs more than it saves
+_PARALLEL_MIN_FILES = 4
+
+# Appended to the YAML file name; a dedicated suffix cannot collide with
+# real .json files next to the templates
+_SIDECAR_SUFFIX = ".cache.json"
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_yaml(path: str, mtime_ns: int, size: int, compile_cache: bool = False) -> Any:
+    """Parse a template file, memoized on its stat identity.
+
+    The mtime/size arguments only form part of the cache key, so an edited
+    file misses the cache and is parsed again. With ``compile_cache`` a
+    ``<name>.yaml.cache.json`` sidecar is read instead when it records the
+    YAML's exact mtime and size, and is refreshed after a YAML parse.
+    Callers must not mutate the returned object.
+    """
+    sidecar = Path(path + _SIDECAR_SUFFIX)
+    if compile_cache:
+        try:
+            cached = _json_loads(sidecar.read_bytes())
+            if cached.get("mtime_ns") == mtime_ns and cached.get("size") == size:
+                return cached["template"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    with open(path, 'rb') as f:
+        template = yaml.load(f, Loader=_SafeLoader)
+
+    if compile_cache:
+        _write_sidecar(sidecar, template, mtime_ns, size)
+    return template
+
+
+def _write_sidecar(sidecar: Path, template: Any, mtime_ns: int, size: int) -> None:
+    """Best-effort write of a template's JSON sidecar, keyed on the YAML's stat."""
+    try:
+        # Stdlib json refuses YAML-only types (dates) instead of coercing them
+        data = json.dumps({"mtime_ns": mtime_ns, "size": size, "template": template})
+        # but turns non-str keys (ints, bools) into strings; only cache a
+        # template that reads back exactly as parsed
+        if json.loads(data)["template"] != template:
+            return
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        tmp.write_text(data)
+        os.replace(tmp, sidecar)
+    except (OSError, TypeError, ValueError):
+        pass
+
 
 class TemplateLoader:
     """Loads baseline templates from YAML files.
@@ -14,9 +81,12 @@ class TemplateLoader:
     - required_nodes: List of expected UI elements
     - structure_signature: Expected layout signature
     - valid_transitions: Allowed state transitions
+
+    Pass ``compile_cache=True`` to keep pre-parsed ``.yaml.cache.json`` sidecars next to
+    each YAML file so fresh processes skip YAML parsing entirely.
     """
     
-    def __init__(self, templates_dir: Optional[str] = None):
+    def __init__(self, templates_dir: Optional[str] = None, compile_cache: bool = False):
         if templates_dir is None:
             # Default to templates directory relative to this file
             current_dir = Path(__file__).parent
@@ -25,6 +95,7 @@ class TemplateLoader:
         self.templates_dir = Path(templates_dir)
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._loaded = False
+        self._compile_cache = compile_cache
     
     def load(self, path: str) -> Dict[str, Any]:
         """Load a single template from a file path.
@@ -51,8 +122,7 @@ class TemplateLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Template not found: {file_path}")
         
-        with open(file_path, 'r') as f:
-            template = yaml.safe_load(f)
+        template = self._read_template(file_path)
         
         # Cache by screen_id if available
         if template and "screen_id" in template:
@@ -72,19 +142,40 @@ class TemplateLoader:
         if not self.templates_dir.exists():
             return {}
         
-        # Load all YAML files
-        for yaml_file in self.templates_dir.glob("*.yaml"):
-            try:
-                # Pass just the filename, not the full path
-                template = self.load(yaml_file.name)
-                if template and "screen_id" in template:
-                    self._cache[template["screen_id"]] = template
-            except Exception as e:
-                print(f"Error loading template {yaml_file}: {e}")
+        # Read and parse in parallel; file reads release the GIL
+        files = [f.resolve() for f in self.templates_dir.glob("*.yaml")]
+        if len(files) >= _PARALLEL_MIN_FILES:
+            workers = min(32, (os.cpu_count() or 1) * 4, len(files))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._try_read_template, files))
+        else:
+            results = [self._try_read_template(f) for f in files]
+        
+        # Aggregate on the calling thread, in glob order
+        for yaml_file, (template, error) in zip(files, results):
+            if error is not None:
+                logger.warning("Error loading template %s: %s", yaml_file, error)
+            elif template and "screen_id" in template:
+                self._cache[template["screen_id"]] = template
         
         self._loaded = True
         return self._cache
     
+    def _read_template(self, file_path: Path) -> Any:
+        """Parse a resolved template path through the shared parse cache."""
+        st = file_path.stat()
+        # Hand out a private copy so callers can't corrupt the parse cache
+        return copy.deepcopy(_parse_yaml(
+            str(file_path), st.st_mtime_ns, st.st_size, self._compile_cache
+        ))
+    
+    def _try_read_template(self, file_path: Path) -> Tuple[Any, Optional[Exception]]:
+        """Worker wrapper returning (template, error) instead of raising."""
+        try:
+            return self._read_template(file_path), None
+        except Exception as e:
+            return None, e
+    
     def get(self, screen_id: str) -> Optional[Dict[str, Any]]:
         """Get a template by screen_id.
         
@@ -1,5 +1,7 @@
 """Validate baseline template structure and content."""
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, FrozenSet, List, Tuple
+
+_MISSING = object()
 
 
 class TemplateValidator:
@@ -13,14 +15,26 @@ class TemplateValidator:
     - Required nodes format
     """
     
+    _required_fields: FrozenSet[str] = frozenset({"screen_id"})
+    _optional_fields: FrozenSet[str] = frozenset({
+        "required_nodes", "structure_signature",
+        "valid_transitions", "metadata", "version"
+    })
+    # Expected type for each typed field, checked only when the key is present
+    _FIELD_TYPES: Dict[str, type] = {
+        "screen_id": str,
+        "required_nodes": list,
+        "structure_signature": str,
+        "valid_transitions": list,
+    }
+    _TRANSITION_SEP = " -> "
+    # Bound on memoized validate_multiple results before the cache is reset
+    _CACHE_LIMIT = 1024
+    
     def __init__(self):
-        self._required_fields: Set[str] = {
-            "screen_id"
-        }
-        self._optional_fields: Set[str] = {
-            "required_nodes", "structure_signature",
-            "valid_transitions", "metadata", "version"
-        }
+        # id(template) -> (template, fingerprint, result); holding the
+        # template keeps its id from being reused while cached
+        self._validation_cache: Dict[int, Tuple[Dict[str, Any], tuple, bool]] = {}
     
     def validate(self, template: Dict[str, Any]) -> bool:
         """Validate a template for correctness.
@@ -41,11 +55,6 @@ class TemplateValidator:
         # Minimal structural checks
         if not template.get("screen_id"):
             return False
-        # Treat required_nodes as optional but validate if present
-        if "required_nodes" in template and not isinstance(template.get("required_nodes", []), list):
-            return False
-        if "structure_signature" in template and not isinstance(template.get("structure_signature"), str):
-            return False
 
         # Check field types
         if not self._validate_field_types(template):
@@ -101,10 +110,11 @@ class TemplateValidator:
             if not isinstance(transitions, list):
                 errors.append("valid_transitions must be a list")
             else:
+                sep = self._TRANSITION_SEP
                 for i, transition in enumerate(transitions):
                     if not isinstance(transition, str):
                         errors.append(f"Transition {i} must be a string")
-                    elif " -> " not in transition and transition != "":
+                    elif transition and sep not in transition:
                         errors.append(f"Invalid transition format: {transition}")
         
         return len(errors) == 0, errors
@@ -115,22 +125,9 @@ class TemplateValidator:
     
     def _validate_field_types(self, template: Dict[str, Any]) -> bool:
         """Check field types are correct."""
-        if "screen_id" in template:
-            if not isinstance(template["screen_id"], str):
-                return False
-        
-        if "required_nodes" in template:
-            if not isinstance(template["required_nodes"], list):
-                return False
-        
-        if "structure_signature" in template:
-            if not isinstance(template["structure_signature"], str):
+        for field, expected in self._FIELD_TYPES.items():
+            if field in template and not isinstance(template[field], expected):
                 return False
-        
-        if "valid_transitions" in template:
-            if not isinstance(template["valid_transitions"], list):
-                return False
-        
         return True
     
     def _validate_transitions(self, transitions: List[Any]) -> bool:
@@ -141,14 +138,8 @@ class TemplateValidator:
         if not isinstance(transitions, list):
             return False
         
-        for transition in transitions:
-            if not isinstance(transition, str):
-                return False
-            # Allow simple identifiers or arrow-separated strings
-            if transition and not isinstance(transition, str):
-                return False
-        
-        return True
+        # Allow simple identifiers or arrow-separated strings
+        return all(isinstance(transition, str) for transition in transitions)
     
     def validate_multiple(self, templates: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
         """Validate multiple templates.
@@ -161,5 +152,33 @@ class TemplateValidator:
         """
         results = {}
         for screen_id, template in templates.items():
-            results[screen_id] = self.validate(template)
+            results[screen_id] = self._validate_cached(template)
         return results
+    
+    def _validate_cached(self, template: Dict[str, Any]) -> bool:
+        """validate() memoized on template identity plus a field fingerprint.
+        
+        The fingerprint snapshots every field validate() reads (lists as
+        tuples), so in-place edits to a cached template are still noticed.
+        """
+        if not isinstance(template, dict):
+            return self.validate(template)
+        
+        fingerprint = self._fingerprint(template)
+        cached = self._validation_cache.get(id(template))
+        if cached is not None and cached[0] is template and cached[1] == fingerprint:
+            return cached[2]
+        
+        result = self.validate(template)
+        if len(self._validation_cache) >= self._CACHE_LIMIT:
+            self._validation_cache.clear()
+        self._validation_cache[id(template)] = (template, fingerprint, result)
+        return result
+    
+    def _fingerprint(self, template: Dict[str, Any]) -> tuple:
+        """Snapshot of the fields that determine validate()'s result."""
+        values = [len(template)]
+        for field in self._FIELD_TYPES:
+            value = template.get(field, _MISSING)
+            values.append(tuple(value) if isinstance(value, list) else value)
+        return tuple(values)
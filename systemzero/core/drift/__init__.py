@@ -1,7 +1,8 @@
-from .matcher import Matcher
+from .matcher import Matcher, normalize_template
 from .diff_engine import DiffEngine
-from .drift_event import DriftEvent
+from .flat_tree import FlatTree, StringInterner
+from .drift_event import DriftEvent, Severity
 from .change import Change
 from .transition_checker import TransitionChecker, TransitionResult
 
-__all__ = ["Matcher", "DiffEngine", "DriftEvent", "Change", "TransitionChecker", "TransitionResult"]
+__all__ = ["Matcher", "normalize_template", "DiffEngine", "FlatTree", "StringInterner", "DriftEvent", "Severity", "Change", "TransitionChecker", "TransitionResult"]
@@ -0,0 +1,417 @@
+"""Tree-walking kernel for DiffEngine.
+
+Kept free of classes and ``self`` state with full type annotations, so the
+module can be compiled with mypyc (``mypyc core/drift/_diff_walk.py``); a
+built extension is imported in place of this file and the pure-Python
+version remains the fallback for non-built installs.
+"""
+import heapq
+import sys
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+Digest = Optional[Tuple[int, int]]
+Digests = Dict[int, Digest]
+# Exact subtree content -> content id, shared by both trees of a diff
+SubtreeIds = Dict[Tuple[Any, ...], int]
+SimilarCache = Dict[Tuple[int, int], bool]
+Alignment = List[Tuple[Optional[int], Optional[int]]]
+ChildMatcher = Callable[[List[Any], List[Any]], Alignment]
+# emit(path, node) for added/removed nodes; emit(path, changes, node) for modified
+EmitNode = Callable[[str, Any], None]
+EmitModified = Callable[[str, Dict[str, Tuple[Any, Any]], Any], None]
+EmitTruncated = Callable[[str], None]
+# (kind, path, node, changes) as yielded by iter_diff_walk
+WalkRecord = Tuple[str, str, Any, Optional[Dict[str, Tuple[Any, Any]]]]
+# Linked (parent, child index) cells; None is the root
+Path = Optional[Tuple[Any, int]]
+
+# Sibling lists shorter than this (m + n) are matched by position
+LCS_MIN_CHILDREN = 8
+# Larger LCS tables fall back to positional matching to bound memory
+LCS_MAX_CELLS = 1_000_000
+# A* searches expanding more states than this fall back to the LCS table
+ASTAR_MAX_EXPANSIONS = 10_000
+
+# Shared stand-in for a missing or None "children" entry
+NO_CHILDREN: Tuple[Any, ...] = ()
+
+# Interned so dict lookups on node keys resolve by pointer comparison
+COMPARE_PROPS: Tuple[str, ...] = tuple(
+    sys.intern(p) for p in ("role", "name", "type", "visible", "enabled", "value")
+)
+
+
+def path_str(path: Path) -> str:
+    """Render a linked path as ``root[i][j]...``."""
+    indices: List[int] = []
+    while path is not None:
+        path, index = path
+        indices.append(index)
+    indices.reverse()
+    return "root" + "".join([f"[{i}]" for i in indices])
+
+
+def nodes_similar(node_a: Dict[str, Any], node_b: Dict[str, Any]) -> bool:
+    """Check if two nodes are similar enough to compare."""
+    # Nodes are similar if they have the same role or type
+    return (node_a.get("role", "") == node_b.get("role", "")
+            or node_a.get("type", "") == node_b.get("type", ""))
+
+
+def collect_property_changes(node_a: Dict[str, Any],
+                             node_b: Dict[str, Any]) -> Optional[Dict[str, Tuple[Any, Any]]]:
+    """Get dictionary of property changes, or None if nothing changed."""
+    changes: Optional[Dict[str, Tuple[Any, Any]]] = None
+    ga = node_a.get
+    gb = node_b.get
+    for prop in COMPARE_PROPS:
+        val_a = ga(prop)
+        val_b = gb(prop)
+        # Interned roles/types and shared values are usually the same object
+        if val_a is val_b:
+            continue
+        if val_a != val_b:
+            if changes is None:
+                changes = {}
+            changes[prop] = (val_a, val_b)
+    return changes
+
+
+def child_key(child: Any) -> Tuple[Any, ...]:
+    """Identity used to line up children: role, type and name for nodes."""
+    if isinstance(child, dict):
+        return (child.get("role"), child.get("type"), child.get("name"))
+    return (child,)
+
+
+def _trim_common(keys_a: List[Tuple[Any, ...]],
+                 keys_b: List[Tuple[Any, ...]]) -> Tuple[int, int, int]:
+    """Get (lo, end_a, end_b) bounding the middle left after common prefix/suffix."""
+    m, n = len(keys_a), len(keys_b)
+    lo = 0
+    while lo < m and lo < n and keys_a[lo] == keys_b[lo]:
+        lo += 1
+    end_a, end_b = m, n
+    while end_a > lo and end_b > lo and keys_a[end_a - 1] == keys_b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    return lo, end_a, end_b
+
+
+def _pair_gap(ops: Alignment,
+              a_start: int, a_end: int, b_start: int, b_end: int) -> None:
+    """Pair an unmatched run positionally; leftovers are removed or added."""
+    paired = min(a_end - a_start, b_end - b_start)
+    ops.extend((a_start + k, b_start + k) for k in range(paired))
+    ops.extend((i, None) for i in range(a_start + paired, a_end))
+    ops.extend((None, j) for j in range(b_start + paired, b_end))
+
+
+def match_children(children_a: List[Any], children_b: List[Any]) -> Alignment:
+    """Align two sibling lists by the LCS of their child keys.
+
+    Returns alignment operations in document order: ``(i, j)`` pairs
+    children_a[i] with children_b[j], ``(i, None)`` marks a removal and
+    ``(None, j)`` an addition. Unmatched runs between LCS anchors are
+    paired positionally so renamed nodes still diff as modified; an
+    insertion near the top no longer shifts every later sibling.
+    """
+    m = len(children_a)
+    keys_a = [child_key(c) for c in children_a]
+    keys_b = [child_key(c) for c in children_b]
+
+    # Common prefix and suffix never need the DP table
+    lo, end_a, end_b = _trim_common(keys_a, keys_b)
+    ops: Alignment = [(i, i) for i in range(lo)]
+    mid_a, mid_b = keys_a[lo:end_a], keys_b[lo:end_b]
+    p, q = len(mid_a), len(mid_b)
+    if p == 0 or q == 0 or p * q > LCS_MAX_CELLS:
+        _pair_gap(ops, lo, end_a, lo, end_b)
+    else:
+        table = [[0] * (q + 1) for _ in range(p + 1)]
+        for i in range(p):
+            prev, row, key = table[i], table[i + 1], mid_a[i]
+            for j in range(q):
+                if key == mid_b[j]:
+                    row[j + 1] = prev[j] + 1
+                else:
+                    row[j + 1] = prev[j + 1] if prev[j + 1] >= row[j] else row[j]
+
+        matches: List[Tuple[int, int]] = []
+        i, j = p, q
+        while i > 0 and j > 0:
+            if mid_a[i - 1] == mid_b[j - 1]:
+                i -= 1
+                j -= 1
+                matches.append((i, j))
+            elif table[i - 1][j] >= table[i][j - 1]:
+                i -= 1
+            else:
+                j -= 1
+        matches.reverse()
+
+        next_a, next_b = 0, 0
+        for i, j in matches:
+            _pair_gap(ops, lo + next_a, lo + i, lo + next_b, lo + j)
+            ops.append((lo + i, lo + j))
+            next_a, next_b = i + 1, j + 1
+        _pair_gap(ops, lo + next_a, end_a, lo + next_b, end_b)
+
+    ops.extend((end_a + k, end_b + k) for k in range(m - end_a))
+    return ops
+
+
+def astar_match_children(children_a: List[Any], children_b: List[Any]) -> Alignment:
+    """Align two sibling lists with an A* search over edit positions.
+
+    States are ``(i, j)`` positions in both lists; keeping an equal key
+    costs 0, and adding, removing or pairing (modifying) a child costs 1.
+    The heuristic ``|(len_a - i) - (len_b - j)|`` is admissible, so the
+    search settles on a minimal edit script while expanding states only
+    around the best-guess diagonal: cost follows the size of the
+    difference, not of the lists. Falls back to match_children if the
+    search expands more than ASTAR_MAX_EXPANSIONS states.
+    """
+    m = len(children_a)
+    keys_a = [child_key(c) for c in children_a]
+    keys_b = [child_key(c) for c in children_b]
+    lo, end_a, end_b = _trim_common(keys_a, keys_b)
+    mid_a, mid_b = keys_a[lo:end_a], keys_b[lo:end_b]
+    p, q = len(mid_a), len(mid_b)
+
+    ops: Alignment = [(i, i) for i in range(lo)]
+    if p == 0 or q == 0:
+        _pair_gap(ops, lo, end_a, lo, end_b)
+    else:
+        came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        best: Dict[Tuple[int, int], int] = {(0, 0): 0}
+        heap: List[Tuple[int, int, int, int]] = [(abs(p - q), 0, 0, 0)]
+        expansions = 0
+        while heap:
+            _, cost, i, j = heapq.heappop(heap)
+            if i == p and j == q:
+                break
+            if cost > best.get((i, j), cost):
+                continue
+            expansions += 1
+            if expansions > ASTAR_MAX_EXPANSIONS:
+                return match_children(children_a, children_b)
+            if i < p and j < q:
+                # Equal keys: following the diagonal is always optimal
+                moves = [(i + 1, j + 1, 0)] if mid_a[i] == mid_b[j] else [
+                    (i + 1, j + 1, 1), (i + 1, j, 1), (i, j + 1, 1)]
+            elif i < p:
+                moves = [(i + 1, j, 1)]
+            else:
+                moves = [(i, j + 1, 1)]
+            for ni, nj, step in moves:
+                new_cost = cost + step
+                if new_cost < best.get((ni, nj), new_cost + 1):
+                    best[(ni, nj)] = new_cost
+                    came_from[(ni, nj)] = (i, j)
+                    heapq.heappush(heap, (new_cost + abs((p - ni) - (q - nj)), new_cost, ni, nj))
+
+        steps: Alignment = []
+        state = (p, q)
+        while state != (0, 0):
+            prev = came_from[state]
+            di, dj = state[0] - prev[0], state[1] - prev[1]
+            steps.append((lo + prev[0] if di else None, lo + prev[1] if dj else None))
+            state = prev
+        steps.reverse()
+        ops.extend(steps)
+
+    ops.extend((end_a + k, end_b + k) for k in range(m - end_a))
+    return ops
+
+
+def align_children(children_a: List[Any], children_b: List[Any],
+                   match: ChildMatcher = match_children) -> List[Tuple[Any, Any, int]]:
+    """Pair up two sibling lists as (child_a, child_b, index) in document order.
+
+    Short lists pair by position; longer ones go through ``match``. A
+    missing side is None. Matched and added children take their new
+    index, removed children keep their old one.
+    """
+    if len(children_a) + len(children_b) < LCS_MIN_CHILDREN:
+        return [(child_a, child_b, i)
+                for i, (child_a, child_b) in enumerate(zip_longest(children_a, children_b))]
+    return [
+        (children_a[i] if i is not None else None,
+         children_b[j] if j is not None else None,
+         j if j is not None else i)
+        for i, j in match(children_a, children_b)
+    ]
+
+
+def index_subtrees(root: Any, digests: Digests, subtree_ids: SubtreeIds) -> None:
+    """Record a Merkle-style (content id, size) digest for every dict node.
+
+    Subtrees are hash-consed: the key of a node is its compared
+    properties plus its children's digests, and ``subtree_ids`` maps
+    each distinct key to a small id. Keys are matched by equality, not
+    just by hash, so equal digests mean the subtrees really are equal
+    and the walk would find nothing but unchanged nodes; size is the
+    unchanged count that walk would report. Pass the same
+    ``subtree_ids`` when indexing both trees of a diff. Nodes with
+    unhashable property values (and their ancestors) get None and are
+    always walked.
+    """
+    if not isinstance(root, dict):
+        return
+    # Iterative post-order: parents are finalized after all children
+    stack: List[Tuple[Dict[str, Any], bool]] = [(root, False)]
+    while stack:
+        node, ready = stack.pop()
+        if not ready:
+            stack.append((node, True))
+            stack.extend((c, False) for c in node.get("children") or NO_CHILDREN
+                         if isinstance(c, dict))
+            continue
+        parts: List[Any] = []
+        size = 1
+        for child in node.get("children") or NO_CHILDREN:
+            if isinstance(child, dict):
+                child_digest = digests[id(child)]
+                if child_digest is None:
+                    break
+                parts.append(child_digest)
+                size += child_digest[1]
+            else:
+                # Wrapped so a bare child can never equal a (id, size) digest
+                parts.append((child,))
+                size += 1
+        else:
+            key = (tuple([node.get(p) for p in COMPARE_PROPS]), tuple(parts))
+            try:
+                content = subtree_ids.setdefault(key, len(subtree_ids))
+            except TypeError:
+                digests[id(node)] = None
+            else:
+                digests[id(node)] = (content, size)
+            continue
+        digests[id(node)] = None
+
+
+def iter_diff_walk(root_a: Any, root_b: Any, digests: Digests,
+                   similar_cache: Optional[SimilarCache] = None,
+                   match: ChildMatcher = match_children, root_path: Path = None,
+                   max_depth: Optional[int] = None,
+                   root_depth: int = 0) -> Generator[WalkRecord, None, int]:
+    """Compare two trees, yielding changes as they are found.
+
+    This is the single walker behind every DiffEngine result shape
+    (dicts, Change objects, DriftEvents, streams). Yields
+    ``(kind, path, node, changes)`` records where kind is "added",
+    "removed", "modified" (``changes`` holds the property changes) or
+    "truncated"; the generator's return value is the number of unchanged
+    nodes encountered. Work stops wherever the consumer stops iterating.
+
+    Iterative pre-order walk over an explicit stack of
+    (node_a, node_b, path, is_child, depth) entries; children are pushed in
+    reverse so changes come out in document order. Paths are linked
+    ``(parent, index)`` tuples, built in O(1) per node and only rendered
+    to strings for nodes that are reported. Deep trees cannot hit
+    the recursion limit. ``similar_cache`` memoizes nodes_similar by
+    ``(id(node_a), id(node_b))`` and must not outlive the trees; ``match``
+    aligns sibling lists too long for positional matching; ``root_path``
+    (and ``root_depth`` their depth) inside a larger tree when walking a
+    subtree. Nodes at ``max_depth`` are compared but not descended into;
+    each cut-off subtree is yielded once as "truncated".
+    """
+    if similar_cache is None:
+        similar_cache = {}
+    # Bound methods keep attribute lookups out of the per-node loop
+    get_digest = digests.get
+    get_similar = similar_cache.get
+    unchanged = 0
+    stack: List[Tuple[Any, Any, Path, bool, int]] = [(root_a, root_b, root_path, False, root_depth)]
+    pop = stack.pop
+    push_all = stack.extend
+    while stack:
+        node_a, node_b, path, is_child, depth = pop()
+        if is_child:
+            # A missing sibling on either side is a plain add/remove
+            if node_a is None and node_b is not None:
+                yield ("added", path_str(path), node_b, None)
+                continue
+            if node_b is None and node_a is not None:
+                yield ("removed", path_str(path), node_a, None)
+                continue
+
+        digest = get_digest(id(node_a))
+        if digest is not None and digest == get_digest(id(node_b)):
+            # Identical content: every node below would count as unchanged
+            unchanged += digest[1]
+            continue
+
+        if not isinstance(node_a, dict) or not isinstance(node_b, dict):
+            if node_a != node_b:
+                where = path_str(path)
+                if node_a:
+                    yield ("removed", where, node_a, None)
+                if node_b:
+                    yield ("added", where, node_b, None)
+            else:
+                unchanged += 1
+            continue
+
+        key = (id(node_a), id(node_b))
+        similar = get_similar(key)
+        if similar is None:
+            similar = similar_cache[key] = nodes_similar(node_a, node_b)
+        if not similar:
+            where = path_str(path)
+            yield ("removed", where, node_a, None)
+            yield ("added", where, node_b, None)
+            continue
+
+        changes = collect_property_changes(node_a, node_b)
+        if changes is not None:
+            yield ("modified", path_str(path), node_b, changes)
+        else:
+            unchanged += 1
+
+        children_a = node_a.get("children") or NO_CHILDREN
+        children_b = node_b.get("children") or NO_CHILDREN
+        if max_depth is not None and depth >= max_depth:
+            if children_a or children_b:
+                yield ("truncated", path_str(path), None, None)
+            continue
+        child_depth = depth + 1
+        pairs = [
+            (child_a, child_b, (path, index), True, child_depth)
+            for child_a, child_b, index in align_children(children_a, children_b, match)
+        ]
+        pairs.reverse()
+        push_all(pairs)
+    return unchanged
+
+
+def diff_walk(root_a: Any, root_b: Any,
+              emit_added: EmitNode, emit_removed: EmitNode, emit_modified: EmitModified,
+              digests: Digests, similar_cache: Optional[SimilarCache] = None,
+              match: ChildMatcher = match_children, root_path: Path = None,
+              max_depth: Optional[int] = None, emit_truncated: Optional[EmitTruncated] = None,
+              root_depth: int = 0) -> int:
+    """Run iter_diff_walk to completion, reporting through the emit callbacks.
+
+    Returns number of unchanged nodes encountered.
+    """
+    walk = iter_diff_walk(root_a, root_b, digests, similar_cache, match, root_path,
+                          max_depth, root_depth)
+    step = walk.__next__
+    while True:
+        try:
+            kind, path, node, changes = step()
+        except StopIteration as done:
+            return done.value
+        if kind == "modified":
+            emit_modified(path, changes, node)
+        elif kind == "added":
+            emit_added(path, node)
+        elif kind == "removed":
+            emit_removed(path, node)
+        elif emit_truncated is not None:
+            emit_truncated(path)
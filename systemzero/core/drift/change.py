@@ -1,14 +1,14 @@
 """Change dataclass for diff results."""
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Change:
     """Represents a single change detected between two UI trees.
     
     Attributes:
-        change_type: Type of change (missing, added, changed, moved)
+        change_type: Type of change (missing, added, changed, moved, depth_exceeded)
         path: Path to the changed node in the tree
         old_value: Previous value (for changed/removed nodes)
         new_value: New value (for changed/added nodes)
@@ -22,13 +22,21 @@ class Change:
     
     def __str__(self) -> str:
         """Human-readable representation."""
-        if self.change_type == "missing":
-            return f"Missing node at {self.path}"
-        elif self.change_type == "added":
-            return f"Added node at {self.path}"
-        elif self.change_type == "changed":
-            return f"Changed {self.path}: {self.old_value} -> {self.new_value}"
-        elif self.change_type == "moved":
-            return f"Moved node from {self.old_value} to {self.new_value}"
-        else:
+        formatter = _FORMATTERS.get(self.change_type)
+        if formatter is None:
             return f"{self.change_type} at {self.path}"
+        return formatter(self)
+
+
+# Change fields as a plain tuple, for streaming without per-change objects
+ChangeRecord = Tuple[str, str, Optional[Any], Optional[Any], Optional[Dict[str, Any]]]
+
+
+# change_type -> formatter; one dict lookup instead of an if/elif ladder
+_FORMATTERS: Dict[str, Callable[[Change], str]] = {
+    "missing": lambda c: f"Missing node at {c.path}",
+    "added": lambda c: f"Added node at {c.path}",
+    "changed": lambda c: f"Changed {c.path}: {c.old_value} -> {c.new_value}",
+    "moved": lambda c: f"Moved node from {c.old_value} to {c.new_value}",
+    "depth_exceeded": lambda c: f"Depth limit exceeded at {c.path}",
+}
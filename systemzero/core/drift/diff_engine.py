@@ -1,7 +1,43 @@
 """Generate detailed diffs between UI trees."""
-from typing import Dict, Any, List, Tuple, Set
-import copy
-from .drift_event import DriftEvent
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from .change import Change, ChangeRecord
+from .drift_event import DriftEvent, NodeRef, summarize_node
+from ._diff_walk import (
+    COMPARE_PROPS, NO_CHILDREN, ChildMatcher, EmitModified, EmitNode, EmitTruncated,
+    align_children,
+    astar_match_children, collect_property_changes, diff_walk, index_subtrees, iter_diff_walk,
+    match_children, nodes_similar,
+)
+from .flat_tree import FlatTree
+
+# Root fan-out above which a parallel engine farms sibling subtrees out
+PARALLEL_THRESHOLD = 64
+
+
+def _diff_pair(child_a: Dict[str, Any], child_b: Dict[str, Any], index: int,
+               match: ChildMatcher,
+               max_depth: Optional[int]) -> Tuple[List[Tuple[str, str, Any, Any]], int]:
+    """Diff one pair of root children in a worker process.
+    
+    Returns (records, unchanged) where records are
+    (kind, path, node, changes) tuples in emission order.
+    """
+    records: List[Tuple[str, str, Any, Any]] = []
+    append = records.append
+    digests: Dict[int, Optional[Tuple[int, int]]] = {}
+    subtree_ids: Dict[Tuple[Any, ...], int] = {}
+    index_subtrees(child_a, digests, subtree_ids)
+    index_subtrees(child_b, digests, subtree_ids)
+    unchanged = diff_walk(
+        child_a, child_b,
+        lambda path, node: append(("added", path, node, None)),
+        lambda path, node: append(("removed", path, node, None)),
+        lambda path, changes, node: append(("modified", path, node, changes)),
+        digests, {}, match, (None, index),
+        max_depth, lambda path: append(("truncated", path, None, None)), 1,
+    )
+    return records, unchanged
 
 
 class DiffEngine:
@@ -15,15 +51,44 @@ class DiffEngine:
     - Content changes
     """
     
-    def __init__(self):
-        self._compare_properties = {"role", "name", "type", "visible", "enabled", "value"}
+    def __init__(self, parallel: bool = False, max_workers: Optional[int] = None):
+        """Initialize the engine.
+        
+        Args:
+            parallel: Diff the root's children in worker processes when the
+                root has more than PARALLEL_THRESHOLD of them. Nodes reported
+                from workers are copies rather than references into the
+                input trees.
+            max_workers: Worker process count for parallel mode
+        """
+        self._compare_properties = COMPARE_PROPS
+        self.parallel = parallel
+        self.max_workers = max_workers
     
-    def diff(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any]) -> Dict[str, Any]:
+    def diff(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+             max_depth: Optional[int] = None) -> Dict[str, Any]:
         """Generate a structured diff between two trees.
         
         Returns a dict with added/removed/modified lists, unchanged count, and similarity score.
         This matches expectations in tests and is easier for UIs to consume.
+        With ``max_depth`` (root is depth 0), deeper nodes are not compared
+        and the result gains a "truncated" list of cut-off subtree paths.
+        """
+        return self._diff(tree_a, tree_b, match_children, max_depth)
+    
+    def diff_astar(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+                   max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Generate a diff, aligning long sibling lists with an A* search.
+        
+        Suited to nearly identical trees: alignment cost grows with the
+        number of edits rather than the list lengths. Returns the same
+        structure as diff().
         """
+        return self._diff(tree_a, tree_b, astar_match_children, max_depth)
+    
+    def _diff(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+              match: ChildMatcher, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Diff two trees using ``match`` to align long sibling lists."""
         if not tree_a and not tree_b:
             return {"added": [], "removed": [], "modified": [], "unchanged": 0, "similarity": 1.0}
         if not tree_a:
@@ -34,23 +99,243 @@ class DiffEngine:
         added: List[Any] = []
         removed: List[Any] = []
         modified: List[Any] = []
+        add_added = added.append
+        add_removed = removed.append
+        add_modified = modified.append
+        truncated: List[str] = []
 
-        root_a = tree_a.get("root") if isinstance(tree_a, dict) and "root" in tree_a else tree_a
-        root_b = tree_b.get("root") if isinstance(tree_b, dict) and "root" in tree_b else tree_b
-
-        unchanged_count = self._diff_nodes(root_a, root_b, added, removed, modified, "root")
+        unchanged_count = self._walk_trees(
+            tree_a, tree_b,
+            lambda path, node: add_added({"path": path, "node": node}),
+            lambda path, node: add_removed({"path": path, "node": node}),
+            lambda path, changes, node: add_modified({"path": path, "changes": changes, "node": node}),
+            match, max_depth=max_depth, emit_truncated=truncated.append,
+        )
 
         total_changes = len(added) + len(removed) + len(modified)
         total_nodes = total_changes + unchanged_count if (total_changes + unchanged_count) > 0 else 1
         similarity = max(0.0, min(1.0, (total_nodes - total_changes) / total_nodes))
 
-        return {
+        result = {
             "added": added,
             "removed": removed,
             "modified": modified,
             "unchanged": unchanged_count,
             "similarity": similarity
         }
+        if max_depth is not None:
+            result["truncated"] = truncated
+        return result
+    
+    def diff_changes(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+                     max_depth: Optional[int] = None) -> List[Change]:
+        """Generate the diff as Change objects.
+        
+        Added nodes become "added", removed nodes "missing", and each
+        changed property of a modified node a "changed" entry at
+        ``<path>.<property>``. Subtrees cut off by ``max_depth`` become a
+        single "depth_exceeded" entry each.
+        """
+        return [Change(*record) for record in self.diff_iter(tree_a, tree_b, max_depth)]
+    
+    def diff_iter(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+                  max_depth: Optional[int] = None) -> Iterator[ChangeRecord]:
+        """Iterate the diff as plain tuples in Change field order.
+        
+        Yields ``(change_type, path, old_value, new_value, node)`` with the
+        same entries as diff_changes(); ``Change(*record)`` builds the
+        object. Consumers that only inspect the fields skip the per-change
+        object allocation.
+        
+        The walk is lazy: it advances only as far as the consumer iterates,
+        so stopping early skips the rest of the comparison (subtree digests
+        are still computed up front). Always runs in-process.
+        """
+        if not tree_a and not tree_b:
+            return
+        if not tree_a:
+            yield ("added", "root", None, tree_b, tree_b)
+            return
+        if not tree_b:
+            yield ("missing", "root", tree_a, None, tree_a)
+            return
+        
+        root_a, root_b, digests = self._index_roots(tree_a, tree_b)
+        walk = iter_diff_walk(root_a, root_b, digests, {}, match_children, None, max_depth)
+        for kind, path, node, changes in walk:
+            if kind == "modified":
+                for prop, (old, new) in changes.items():
+                    yield ("changed", f"{path}.{prop}", old, new, node)
+            elif kind == "added":
+                yield ("added", path, None, node, node)
+            elif kind == "removed":
+                yield ("missing", path, node, None, node)
+            else:
+                yield ("depth_exceeded", path, None, None, None)
+    
+    def diff_events(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+                    severity: str = "warning", snapshot: bool = False,
+                    max_depth: Optional[int] = None) -> List[DriftEvent]:
+        """Generate the diff as DriftEvents, one per added/removed/modified node.
+        
+        Events reference the changed nodes and summarize them when
+        serialized; pass ``snapshot=True`` if the trees may be mutated
+        before the events are reported.
+        """
+        events: List[DriftEvent] = []
+        append = events.append
+        create = self._create_drift_event
+        self._walk_trees(
+            tree_a, tree_b,
+            lambda path, node: append(create("added", node, path, severity, snapshot=snapshot)),
+            lambda path, node: append(create("removed", node, path, severity, snapshot=snapshot)),
+            lambda path, changes, node: append(
+                create("modified", node, path, severity, changes, snapshot=snapshot)),
+            max_depth=max_depth,
+            emit_truncated=lambda path: append(create("depth_exceeded", None, path, severity)),
+        )
+        return events
+    
+    def _walk_trees(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+                    emit_added: EmitNode, emit_removed: EmitNode, emit_modified: EmitModified,
+                    match: ChildMatcher = match_children, *,
+                    max_depth: Optional[int] = None,
+                    emit_truncated: Optional[EmitTruncated] = None) -> int:
+        """Run the shared walker over two trees; returns the unchanged count.
+        
+        An empty tree on one side is reported as the other tree's root
+        being added or removed.
+        """
+        if not tree_a and not tree_b:
+            return 0
+        if not tree_a:
+            emit_added("root", tree_b)
+            return 0
+        if not tree_b:
+            emit_removed("root", tree_a)
+            return 0
+
+        root_a, root_b, digests = self._index_roots(tree_a, tree_b)
+
+        # Pair similarity is memoized for this call only: ids are stable
+        # while both trees are alive, not across calls
+        similar_cache: Dict[Tuple[int, int], bool] = {}
+        if (self.parallel and (max_depth is None or max_depth > 0)
+                and self._fans_out(root_a, root_b, digests)):
+            return self._walk_parallel(root_a, root_b, emit_added, emit_removed, emit_modified,
+                                       digests, similar_cache, match, max_depth, emit_truncated)
+        return diff_walk(root_a, root_b, emit_added, emit_removed, emit_modified,
+                         digests, similar_cache, match, None, max_depth, emit_truncated)
+    
+    def _index_roots(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any]
+                     ) -> Tuple[Any, Any, Dict[int, Optional[Tuple[int, int]]]]:
+        """Unwrap both roots and compute their subtree digests."""
+        root_a = tree_a.get("root") if isinstance(tree_a, dict) and "root" in tree_a else tree_a
+        root_b = tree_b.get("root") if isinstance(tree_b, dict) and "root" in tree_b else tree_b
+
+        # Subtree digests let identical subtrees be skipped without descent
+        digests: Dict[int, Optional[Tuple[int, int]]] = {}
+        subtree_ids: Dict[Tuple[Any, ...], int] = {}
+        index_subtrees(root_a, digests, subtree_ids)
+        index_subtrees(root_b, digests, subtree_ids)
+        return root_a, root_b, digests
+    
+    def _fans_out(self, root_a: Any, root_b: Any,
+                  digests: Dict[int, Optional[Tuple[int, int]]]) -> bool:
+        """Check whether two roots are wide enough to diff in parallel."""
+        if not isinstance(root_a, dict) or not isinstance(root_b, dict):
+            return False
+        width = max(len(root_a.get("children") or NO_CHILDREN),
+                    len(root_b.get("children") or NO_CHILDREN))
+        if width <= PARALLEL_THRESHOLD or not nodes_similar(root_a, root_b):
+            return False
+        digest = digests.get(id(root_a))
+        return digest is None or digest != digests.get(id(root_b))
+    
+    def _walk_parallel(self, root_a: Dict[str, Any], root_b: Dict[str, Any],
+                       emit_added: EmitNode, emit_removed: EmitNode, emit_modified: EmitModified,
+                       digests: Dict[int, Optional[Tuple[int, int]]],
+                       similar_cache: Dict[Tuple[int, int], bool], match: ChildMatcher,
+                       max_depth: Optional[int] = None,
+                       emit_truncated: Optional[EmitTruncated] = None) -> int:
+        """Walk two wide roots, diffing changed child pairs in worker processes.
+        
+        Identical subtrees, one-sided children and non-node children are
+        handled in-process; results are emitted in the same order as the
+        sequential walk.
+        """
+        unchanged = 0
+        changes = collect_property_changes(root_a, root_b)
+        if changes is not None:
+            emit_modified("root", changes, root_b)
+        else:
+            unchanged += 1
+
+        aligned = align_children(root_a.get("children") or NO_CHILDREN,
+                                 root_b.get("children") or NO_CHILDREN, match)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures: List[Optional[Future]] = []
+            for child_a, child_b, index in aligned:
+                digest = digests.get(id(child_a))
+                if (isinstance(child_a, dict) and isinstance(child_b, dict)
+                        and (digest is None or digest != digests.get(id(child_b)))):
+                    futures.append(pool.submit(_diff_pair, child_a, child_b, index, match, max_depth))
+                else:
+                    futures.append(None)
+
+            for (child_a, child_b, index), future in zip(aligned, futures):
+                if future is None:
+                    if child_a is None and child_b is not None:
+                        emit_added(f"root[{index}]", child_b)
+                    elif child_b is None and child_a is not None:
+                        emit_removed(f"root[{index}]", child_a)
+                    else:
+                        unchanged += diff_walk(child_a, child_b, emit_added, emit_removed,
+                                               emit_modified, digests, similar_cache, match,
+                                               (None, index), max_depth, emit_truncated, 1)
+                    continue
+                records, count = future.result()
+                unchanged += count
+                for kind, path, node, node_changes in records:
+                    if kind == "added":
+                        emit_added(path, node)
+                    elif kind == "removed":
+                        emit_removed(path, node)
+                    elif kind == "truncated":
+                        if emit_truncated is not None:
+                            emit_truncated(path)
+                    else:
+                        emit_modified(path, node_changes, node)
+        return unchanged
+    
+    def diff_flat(self, flat_a: FlatTree, flat_b: FlatTree) -> Dict[str, Any]:
+        """Generate the same result as diff() from pre-flattened trees.
+        
+        Same-shaped trees are compared column by column, so a baseline
+        flattened once can be diffed cheaply against many live trees.
+        Falls back to diff() when the shapes differ or nodes do not pair up.
+        """
+        rows = None
+        if flat_a.tree and flat_b.tree and flat_a.same_shape(flat_b):
+            rows = flat_a.changed_rows(flat_b)
+        if rows is None:
+            return self.diff(flat_a.tree, flat_b.tree)
+
+        nodes_a, nodes_b = flat_a.nodes, flat_b.nodes
+        modified = []
+        for i in rows:
+            # Column compares skip the identity shortcut (e.g. a shared NaN)
+            changes = collect_property_changes(nodes_a[i], nodes_b[i])
+            if changes is not None:
+                modified.append({"path": flat_a.paths[i], "changes": changes, "node": nodes_b[i]})
+        unchanged_count = flat_a.size - len(modified)
+        return {
+            "added": [],
+            "removed": [],
+            "modified": modified,
+            "unchanged": unchanged_count,
+            "similarity": unchanged_count / flat_a.size
+        }
     
     def diff_summary(self, result: Dict[str, Any]) -> str:
         """Generate a human-readable summary from structured diff result."""
@@ -76,96 +361,27 @@ class DiffEngine:
         similarity = diff_result.get("similarity", 0)
         return similarity < threshold
     
-    def _diff_nodes(self, node_a: Any, node_b: Any,
-                    added: List[Any], removed: List[Any], modified: List[Any],
-                    path: str) -> int:
-        """Recursively compare nodes and collect changes.
-        Returns number of unchanged nodes encountered.
-        """
-        unchanged = 0
-        if not isinstance(node_a, dict) or not isinstance(node_b, dict):
-            if node_a != node_b:
-                if node_a:
-                    removed.append({"path": path, "node": node_a})
-                if node_b:
-                    added.append({"path": path, "node": node_b})
-            else:
-                unchanged += 1
-            return unchanged
-
-        if not self._nodes_similar(node_a, node_b):
-            removed.append({"path": path, "node": node_a})
-            added.append({"path": path, "node": node_b})
-            return unchanged
-
-        if self._properties_changed(node_a, node_b):
-            changes = self._get_property_changes(node_a, node_b)
-            modified.append({"path": path, "changes": changes, "node": node_b})
-        else:
-            unchanged += 1
+    def has_significant_changes_stream(self, tree_a: Dict[str, Any], tree_b: Dict[str, Any],
+                                       threshold: int) -> bool:
+        """Check whether two trees differ by more than ``threshold`` changes.
         
-        children_a = node_a.get("children", [])
-        children_b = node_b.get("children", [])
-        unchanged += self._diff_children(children_a, children_b, added, removed, modified, path)
-        return unchanged
-    
-    def _diff_children(self, children_a: list, children_b: list,
-                       added: List[Any], removed: List[Any], modified: List[Any], parent_path: str) -> int:
-        """Compare lists of children. Returns count of unchanged child nodes."""
-        unchanged = 0
-        max_len = max(len(children_a), len(children_b))
-        for i in range(max_len):
-            child_a = children_a[i] if i < len(children_a) else None
-            child_b = children_b[i] if i < len(children_b) else None
-            child_path = f"{parent_path}[{i}]"
-            if child_a is None and child_b is not None:
-                added.append({"path": child_path, "node": child_b})
-            elif child_b is None and child_a is not None:
-                removed.append({"path": child_path, "node": child_a})
-            else:
-                unchanged += self._diff_nodes(child_a, child_b, added, removed, modified, child_path)
-        return unchanged
-    
-    def _nodes_similar(self, node_a: Dict[str, Any], node_b: Dict[str, Any]) -> bool:
-        """Check if two nodes are similar enough to compare."""
-        # Nodes are similar if they have the same role or type
-        role_a = node_a.get("role", "")
-        role_b = node_b.get("role", "")
-        type_a = node_a.get("type", "")
-        type_b = node_b.get("type", "")
-        
-        return role_a == role_b or type_a == type_b
-    
-    def _properties_changed(self, node_a: Dict[str, Any], node_b: Dict[str, Any]) -> bool:
-        """Check if any compared properties changed."""
-        for prop in self._compare_properties:
-            if node_a.get(prop) != node_b.get(prop):
+        Counts diff_iter() entries and stops walking as soon as the count
+        passes the threshold, instead of materializing the whole diff.
+        """
+        count = 0
+        for _ in self.diff_iter(tree_a, tree_b):
+            count += 1
+            if count > threshold:
                 return True
         return False
     
-    def _get_property_changes(self, node_a: Dict[str, Any], node_b: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
-        """Get dictionary of property changes."""
-        changes = {}
-        for prop in self._compare_properties:
-            val_a = node_a.get(prop)
-            val_b = node_b.get(prop)
-            if val_a != val_b:
-                changes[prop] = (val_a, val_b)
-        return changes
-    
     def _summarize_node(self, node: Any) -> Dict[str, Any]:
         """Create a summary of a node for diff output."""
-        if not isinstance(node, dict):
-            return {"value": node}
-        
-        return {
-            "role": node.get("role"),
-            "name": node.get("name"),
-            "type": node.get("type")
-        }
+        return summarize_node(node)
     
     def _create_drift_event(self, change_type: str, node: Any, location: str, 
-                           severity: str, changes: Dict[str, Tuple[Any, Any]] = None) -> DriftEvent:
+                           severity: str, changes: Dict[str, Tuple[Any, Any]] = None,
+                           snapshot: bool = False) -> DriftEvent:
         """Create a DriftEvent for a detected change.
         
         Args:
@@ -174,14 +390,14 @@ class DiffEngine:
             location: Path to the node in the tree
             severity: Severity level (info, warning, critical)
             changes: Optional property changes for modified nodes
+            snapshot: Summarize the node now instead of keeping a reference
+                that is summarized when the event details are first read
             
         Returns:
             DriftEvent object
         """
-        node_summary = self._summarize_node(node)
-        
         details = {
-            "node": node_summary,
+            "node": self._summarize_node(node) if snapshot else NodeRef(node),
             "location": location
         }
         
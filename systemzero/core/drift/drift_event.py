@@ -1,7 +1,55 @@
 """Drift event data structure for UI changes."""
+from enum import IntEnum
+from hashlib import blake2b
+from itertools import count
 from typing import Dict, Any, Optional
 import time
 
+# Per-process sequence number; keeps ids distinct within one clock tick
+_event_seq = count()
+
+
+def summarize_node(node: Any) -> Dict[str, Any]:
+    """Project a tree node onto the fields reported in drift events."""
+    if not isinstance(node, dict):
+        return {"value": node}
+    return {
+        "role": node.get("role"),
+        "name": node.get("name"),
+        "type": node.get("type")
+    }
+
+
+class Severity(IntEnum):
+    """Ordered drift severity levels; compare with ``>=`` for thresholds."""
+    INFO = 0
+    WARNING = 1
+    CRITICAL = 2
+
+
+_SEVERITY_LEVELS: Dict[str, Severity] = {level.name.lower(): level for level in Severity}
+
+
+class NodeRef:
+    """Reference to a tree node in event details, summarized on first read.
+    
+    Holding the node instead of a per-event summary dict keeps event
+    creation allocation-light; the node must not be mutated before the
+    event's details are read. DriftEvent.details replaces the reference
+    with its summary, so callers only ever see plain dicts.
+    """
+    __slots__ = ("node",)
+    
+    def __init__(self, node: Any):
+        self.node = node
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get the serialized node summary."""
+        return summarize_node(self.node)
+    
+    def __repr__(self) -> str:
+        return f"NodeRef({self.summary()!r})"
+
 
 class DriftEvent:
     """Represents a detected drift from baseline expectations.
@@ -16,26 +64,61 @@ class DriftEvent:
     - info: Minor expected variation
     - warning: Noteworthy change
     - critical: Significant drift or manipulation
+    
+    ``level`` is the severity as a Severity member (None for severity
+    strings outside the three levels). Events are treated as immutable
+    once created: the serialized form is built on the first to_dict()
+    call and reused afterwards.
     """
+    __slots__ = ("drift_type", "severity", "level", "_details", "location", "change_type",
+                 "timestamp", "event_id", "_dict")
     
     def __init__(self, drift_type: str, severity: str, details: Dict[str, Any], 
                  location: Optional[str] = None, change_type: Optional[str] = None):
         self.drift_type = drift_type
         self.severity = severity
-        self.details = details
+        self._details = details
         self.location = location
         self.change_type = change_type
         self.timestamp = time.time()
         self.event_id = self._generate_event_id()
+        self.level: Optional[Severity] = _SEVERITY_LEVELS.get(severity)
+        self._dict: Optional[Dict[str, Any]] = None
+    
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Event details, with a referenced node resolved to its summary.
+        
+        The summary replaces the NodeRef on first access, which also
+        releases the referenced subtree.
+        """
+        details = self._details
+        node = details.get("node")
+        if isinstance(node, NodeRef):
+            details = self._details = {**details, "node": node.summary()}
+        return details
     
     def _generate_event_id(self) -> str:
-        """Generate a unique event ID."""
-        import hashlib
-        data = f"{self.drift_type}:{self.severity}:{self.timestamp}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        """Generate a unique event ID.
+        
+        Ids only need to be distinct, not tamper-evident (the log hash
+        chain covers integrity), so a 64-bit BLAKE2b digest is used.
+        """
+        data = f"{self.drift_type}:{self.severity}:{self.timestamp}:{next(_event_seq)}"
+        return blake2b(data.encode(), digest_size=8).hexdigest()
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert event to dictionary for serialization."""
+        """Convert event to dictionary for serialization.
+        
+        Returns a fresh top-level dict each call, since log writers add
+        keys to it; ``details`` is shared between calls.
+        """
+        if self._dict is None:
+            self._dict = self._build_dict()
+        return dict(self._dict)
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the serialized form."""
         result = {
             "event_id": self.event_id,
             "drift_type": self.drift_type,
@@ -54,27 +137,21 @@ class DriftEvent:
     
     def is_critical(self) -> bool:
         """Check if event is critical severity."""
-        return self.severity == "critical"
+        return self.level is Severity.CRITICAL
     
     def get_summary(self) -> str:
         """Get a human-readable summary of the event."""
-        summary_parts = [
-            f"[{self.severity.upper()}]",
-            f"Drift Type: {self.drift_type}"
-        ]
+        details = self.details
+        summary = f"[{self.severity.upper()}] | Drift Type: {self.drift_type}"
         
         # Add key details
-        if "screen_id" in self.details:
-            summary_parts.append(f"Screen: {self.details['screen_id']}")
-        
-        if "transition" in self.details:
-            summary_parts.append(f"Transition: {self.details['transition']}")
-        
-        if "similarity" in self.details:
-            similarity = self.details['similarity']
-            summary_parts.append(f"Similarity: {similarity:.1%}")
-        
-        return " | ".join(summary_parts)
+        if "screen_id" in details:
+            summary += f" | Screen: {details['screen_id']}"
+        if "transition" in details:
+            summary += f" | Transition: {details['transition']}"
+        if "similarity" in details:
+            summary += f" | Similarity: {details['similarity']:.1%}"
+        return summary
     
     @classmethod
     def create_layout_drift(cls, screen_id: str, similarity: float, 
@@ -0,0 +1,191 @@
+"""Columnar snapshot of a UI tree for repeated diffs against one baseline."""
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to plain list columns
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to vectorized numpy
+    njit = None
+    prange = range
+
+from ._diff_walk import COMPARE_PROPS, LCS_MIN_CHILDREN, NO_CHILDREN
+
+# Child key properties; compared as integer ids when trees share an interner
+_KEY_PROPS = ("role", "type", "name")
+
+
+class StringInterner:
+    """Assigns small integer ids to property values.
+
+    FlatTrees built with the same interner store role/type/name as int32
+    id columns, so comparing them is an integer array compare instead of
+    per-object rich comparison. Share one interner between a baseline and
+    the live trees diffed against it.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ids(self, values: List[Any]) -> Any:
+        """Map values to an int32 id array (raises TypeError if unhashable)."""
+        table = self._ids
+        setdefault = table.setdefault
+        return np.fromiter((setdefault(v, len(table)) for v in values),
+                           dtype=np.int32, count=len(values))
+
+
+def _keys_changed_numpy(role_a, role_b, type_a, type_b, name_a, name_b):
+    """Mask of rows whose key ids differ."""
+    return (role_a != role_b) | (type_a != type_b) | (name_a != name_b)
+
+
+def _keys_changed_kernel(role_a, role_b, type_a, type_b, name_a, name_b):
+    """Mask of rows whose key ids differ, as an explicit loop for numba."""
+    n = role_a.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    for i in prange(n):
+        if role_a[i] != role_b[i] or type_a[i] != type_b[i] or name_a[i] != name_b[i]:
+            mask[i] = True
+    return mask
+
+
+_keys_changed = njit(parallel=True)(_keys_changed_kernel) if njit is not None else _keys_changed_numpy
+
+
+def _column(values: List[Any]) -> Any:
+    """Build an object column; list-valued properties must stay scalar cells."""
+    if np is None:
+        return values
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+class FlatTree:
+    """UI tree flattened into structure-of-arrays form.
+
+    Nodes are stored in pre-order (the order DiffEngine reports changes
+    in) with one column per compared property plus ``parent_idx``,
+    ``first_child_idx`` and ``n_children``. Two FlatTrees with the same
+    shape can then be compared column-wise instead of node by node; the
+    baseline is flattened once and reused across many live trees.
+
+    The snapshot is taken at construction; later mutation of the source
+    tree is not reflected.
+
+    Args:
+        tree: UI tree, optionally wrapped as ``{"root": ...}``
+        interner: Shared StringInterner; trees built with the same one
+            compare role/type/name as integer ids
+    """
+
+    def __init__(self, tree: Dict[str, Any], interner: Optional[StringInterner] = None):
+        self.tree = tree
+        root = tree.get("root") if isinstance(tree, dict) and "root" in tree else tree
+
+        nodes: List[Any] = []
+        paths: List[str] = []
+        parent_idx: List[int] = []
+        n_children: List[int] = []
+        # Only trees made entirely of dict nodes take the columnar path
+        self.simple = isinstance(root, dict)
+
+        stack = [(root, "root", -1)]
+        while stack and self.simple:
+            node, path, parent = stack.pop()
+            if not isinstance(node, dict):
+                self.simple = False
+                break
+            index = len(nodes)
+            children = node.get("children") or NO_CHILDREN
+            nodes.append(node)
+            paths.append(path)
+            parent_idx.append(parent)
+            n_children.append(len(children))
+            stack.extend((children[i], f"{path}[{i}]", index)
+                         for i in range(len(children) - 1, -1, -1))
+
+        self.nodes = nodes
+        self.paths = paths
+        self.size = len(nodes)
+        self.parent_idx = parent_idx
+        self.n_children = n_children
+        # Pre-order puts a node's first child directly after it
+        self.first_child_idx = [i + 1 if count else -1 for i, count in enumerate(n_children)]
+        self.columns = {prop: _column([n.get(prop) for n in nodes]) for prop in COMPARE_PROPS}
+        self.interner = interner
+        self.key_ids = None
+        self.similar_ids = None
+        if interner is not None and np is not None:
+            try:
+                self.key_ids = {p: interner.ids([n.get(p) for n in nodes]) for p in _KEY_PROPS}
+                self.similar_ids = {
+                    p: interner.ids([n.get(p, "") for n in nodes]) for p in ("role", "type")
+                }
+            except TypeError:
+                self.key_ids = None  # Unhashable key values: compare the object columns
+        # Siblings in lists long enough for LCS matching are paired by key,
+        # so a key change there can shift the alignment
+        lcs_matched = [p >= 0 and 2 * n_children[p] >= LCS_MIN_CHILDREN for p in parent_idx]
+        self.lcs_matched = np.array(lcs_matched, dtype=bool) if np is not None else lcs_matched
+        # DiffEngine pairs nodes by role or type with "" for a missing key
+        self.similar_keys = {
+            prop: _column([n.get(prop, "") for n in nodes]) for prop in ("role", "type")
+        }
+
+    def same_shape(self, other: "FlatTree") -> bool:
+        """Check whether both trees have identical structure."""
+        return (self.simple and other.simple and self.size == other.size
+                and self.n_children == other.n_children)
+
+    def changed_rows(self, other: "FlatTree") -> Optional[List[int]]:
+        """Get indices of nodes whose compared properties differ.
+
+        Both trees must have the same shape. Returns None if any node pair
+        is dissimilar (neither role nor type matches), since the dict walk
+        reports those as remove+add and skips their subtrees, or if a child
+        key (role, type, name) changed where siblings are LCS-matched and
+        might not pair up by position.
+        """
+        if np is None:
+            return self._changed_rows_loop(other)
+        shared_ids = (self.key_ids is not None and other.key_ids is not None
+                      and self.interner is other.interner)
+        # Role/type taxonomies are small, so id columns compare as plain ints
+        keys_a, keys_b = ((self.similar_ids, other.similar_ids) if shared_ids
+                          else (self.similar_keys, other.similar_keys))
+        similar = (keys_a["role"] == keys_b["role"]) | (keys_a["type"] == keys_b["type"])
+        if not similar.all():
+            return None
+        if shared_ids:
+            ids_a, ids_b = self.key_ids, other.key_ids
+            key_changed = _keys_changed(ids_a["role"], ids_b["role"], ids_a["type"], ids_b["type"],
+                                        ids_a["name"], ids_b["name"])
+        else:
+            key_changed = np.zeros(self.size, dtype=bool)
+            for prop in _KEY_PROPS:
+                key_changed |= self.columns[prop] != other.columns[prop]
+        if (key_changed & self.lcs_matched).any():
+            return None
+        changed = key_changed
+        for prop in ("visible", "enabled", "value"):
+            changed |= self.columns[prop] != other.columns[prop]
+        return np.flatnonzero(changed).tolist()
+
+    def _changed_rows_loop(self, other: "FlatTree") -> Optional[List[int]]:
+        """Per-node fallback for changed_rows when numpy is unavailable."""
+        keys_a, keys_b = self.similar_keys, other.similar_keys
+        for i in range(self.size):
+            if keys_a["role"][i] != keys_b["role"][i] and keys_a["type"][i] != keys_b["type"][i]:
+                return None
+        key_columns = [(self.columns[p], other.columns[p]) for p in _KEY_PROPS]
+        for i in range(self.size):
+            if self.lcs_matched[i] and any(col_a[i] != col_b[i] for col_a, col_b in key_columns):
+                return None
+        columns = [(self.columns[p], other.columns[p]) for p in COMPARE_PROPS]
+        return [i for i in range(self.size) if any(col_a[i] != col_b[i] for col_a, col_b in columns)]
@@ -1,5 +1,42 @@
 """Match UI trees against baseline templates."""
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, NamedTuple, Optional, List, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to per-pair scoring
+    np = None
+
+
+class _TreeStats(NamedTuple):
+    """Per-tree metrics used by the scoring components."""
+    names: Set[Any]
+    roles: Set[Any]
+    depth: int
+    count: int
+
+
+def normalize_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a template with its lookup fields pre-indexed.
+    
+    Adds ``_required_nodes_set`` and ``_expected_roles_set`` frozensets so
+    repeated scoring against the template uses set operations instead of
+    rebuilding sets. The copy snapshots the fields and is not
+    JSON-serializable; score_matrix() builds these copies internally.
+    
+    Args:
+        template: Baseline template
+        
+    Returns:
+        New template dict with the indexed fields added
+    """
+    prepared = dict(template)
+    required_nodes = template.get("required_nodes") or []
+    required_set = frozenset(required_nodes)
+    # Duplicate entries weigh the list-based score; keep the list path for them
+    if len(required_set) == len(required_nodes):
+        prepared["_required_nodes_set"] = required_set
+    prepared["_expected_roles_set"] = frozenset(template.get("expected_roles") or [])
+    return prepared
 
 
 class Matcher:
@@ -10,10 +47,34 @@ class Matcher:
     - Required nodes matching (semantic elements present)
     - Similarity scoring (fuzzy matching)
     - Role-based matching (element types present)
+    
+    With ``cache_tree_stats=True`` the metrics of each scored tree are kept
+    and reused when the same tree object is scored again, e.g. across
+    frames of a drift loop. Cached trees must not be mutated afterwards.
+    
+    With ``cache_matches=True`` find_best_match remembers its best template
+    per tree signature (names, roles, depth, node count) and template list,
+    so a steady stream of recurring screens skips the template sweep.
+    Scores depend only on that signature, so cached results are exact as
+    long as the templates are not mutated.
     """
+    # Bound on cached tree metrics before the cache is reset
+    _STATS_CACHE_LIMIT = 128
+    # Bound on remembered best matches before the cache is reset
+    _MATCH_CACHE_LIMIT = 1024
     
-    def __init__(self, similarity_threshold: float = 0.8):
+    def __init__(self, similarity_threshold: float = 0.8, cache_tree_stats: bool = False,
+                 cache_matches: bool = False):
         self.similarity_threshold = similarity_threshold
+        self.cache_tree_stats = cache_tree_stats
+        self.cache_matches = cache_matches
+        # id(tree) -> (tree, stats); holding the tree keeps its id from
+        # being reused while cached
+        self._stats_cache: Dict[int, Tuple[Dict[str, Any], _TreeStats]] = {}
+        # (signature, template ids) -> (templates, best_template, best_score);
+        # holding the templates keeps their ids from being reused while cached
+        self._match_cache: Dict[Tuple[Any, ...], Tuple[Tuple[Dict[str, Any], ...],
+                                                       Optional[Dict[str, Any]], float]] = {}
     
     def match(self, tree: Dict[str, Any], template: Dict[str, Any]) -> bool:
         """Determine if a tree matches a template.
@@ -25,38 +86,57 @@ class Matcher:
         Returns:
             True if tree matches template within threshold
         """
-        score = self.similarity_score(tree, template)
+        score = self.similarity_score(tree, template,
+                                      early_exit_threshold=self.similarity_threshold)
         return score >= self.similarity_threshold
     
-    def similarity_score(self, tree: Dict[str, Any], template: Dict[str, Any]) -> float:
+    def similarity_score(self, tree: Dict[str, Any], template: Dict[str, Any],
+                         early_exit_threshold: Optional[float] = None) -> float:
         """Calculate similarity score between tree and template.
         
         Args:
             tree: Normalized UI tree
             template: Baseline template
+            early_exit_threshold: Stop scoring once the score provably
+                cannot reach this value; the result is then an upper bound
+                that is below the threshold rather than the exact score
             
         Returns:
             Similarity score from 0.0 to 1.0
         """
         if not tree or not template:
             return 0.0
-        
-        scores = []
+        return self._score_against_template(tree, self._tree_stats(tree), template,
+                                            early_exit_threshold)
+    
+    def _score_against_template(self, tree: Dict[str, Any], stats: _TreeStats,
+                                template: Dict[str, Any],
+                                early_exit_threshold: Optional[float] = None) -> float:
+        """Score a tree whose metrics are already collected against a template.
+        
+        Components are added in weight order; before each of the later
+        ones, the best case (remaining components all 1.0) is checked
+        against ``early_exit_threshold``.
+        """
+        if not template:
+            return 0.0
         
         # Check required nodes (40% weight)
-        required_score = self._check_required_nodes(tree, template)
-        scores.append((required_score, 0.4))
+        weighted_sum = self._check_required_nodes(tree, template, stats) * 0.4
+        if early_exit_threshold is not None:
+            best_case = weighted_sum + 0.4 + 0.2
+            if best_case < early_exit_threshold:
+                return best_case
         
         # Check structure similarity (40% weight)
-        structure_score = self._check_structure(tree, template)
-        scores.append((structure_score, 0.4))
+        weighted_sum += self._check_structure(tree, template, stats) * 0.4
+        if early_exit_threshold is not None:
+            best_case = weighted_sum + 0.2
+            if best_case < early_exit_threshold:
+                return best_case
         
         # Check role distribution (20% weight)
-        role_score = self._check_roles(tree, template)
-        scores.append((role_score, 0.2))
-        
-        # Calculate weighted average
-        weighted_sum = sum(score * weight for score, weight in scores)
+        weighted_sum += self._check_roles(tree, template, stats) * 0.2
         return weighted_sum
     
     def calculate_score(self, tree: Dict[str, Any], template: Dict[str, Any]) -> float:
@@ -87,35 +167,203 @@ class Matcher:
         best_template = None
         best_score = 0.0
         
+        if tree:
+            # The tree is the same for every template; walk it once
+            stats = self._tree_stats(tree)
+            if self.cache_matches:
+                best_template, best_score = self._cached_best_template(tree, stats, templates)
+            else:
+                best_template, best_score = self._best_template(tree, stats, templates)
+        
+        if best_score >= self.similarity_threshold:
+            return (best_template, best_score)
+        
+        return None
+    
+    def _best_template(self, tree: Dict[str, Any], stats: _TreeStats,
+                       templates: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Get the highest-scoring template and its score (first one wins ties)."""
+        best_template = None
+        best_score = 0.0
         for template in templates:
-            score = self.similarity_score(tree, template)
+            # A template only has to be scored fully if it can beat the best so far
+            score = self._score_against_template(tree, stats, template, best_score)
             if score > best_score:
                 best_score = score
                 best_template = template
+        return best_template, best_score
+    
+    def _cached_best_template(self, tree: Dict[str, Any], stats: _TreeStats,
+                              templates: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """_best_template memoized on the tree signature and template list.
         
-        if best_score >= self.similarity_threshold:
-            return (best_template, best_score)
+        The threshold is applied by the caller, so changing
+        ``similarity_threshold`` does not invalidate cached entries.
+        """
+        key = (frozenset(stats.names), frozenset(stats.roles), stats.depth, stats.count,
+               tuple(map(id, templates)))
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            return cached[1], cached[2]
+        best_template, best_score = self._best_template(tree, stats, templates)
+        if len(self._match_cache) >= self._MATCH_CACHE_LIMIT:
+            self._match_cache.clear()
+        self._match_cache[key] = (tuple(templates), best_template, best_score)
+        return best_template, best_score
+    
+    def score_matrix(self, trees: List[Dict[str, Any]], templates: List[Dict[str, Any]]) -> Any:
+        """Score every tree against every template in one batch.
         
-        return None
+        Entry ``[i][j]`` equals ``similarity_score(trees[i], templates[j])``.
+        With numpy, names and roles are mapped to template vocabulary
+        columns so the set overlaps of all pairs are two matrix products,
+        and the component scores are computed array-wide.
+        
+        Args:
+            trees: Normalized UI trees, e.g. a batch of captured frames
+            templates: Baseline templates
+            
+        Returns:
+            N x M float array, or nested lists when numpy is unavailable
+        """
+        stats = [self._tree_stats(tree) if tree else None for tree in trees]
+        # Index each template once for the whole batch; only scores leave
+        # this method, so callers never see the indexed copies
+        templates = [normalize_template(template) if template else template
+                     for template in templates]
+        if np is None:
+            return [
+                [self._score_against_template(tree, s, template) if s is not None else 0.0
+                 for template in templates]
+                for tree, s in zip(trees, stats)
+            ]
+        
+        n, m = len(trees), len(templates)
+        if n == 0 or m == 0:
+            return np.zeros((n, m))
+        present = np.array([s is not None for s in stats])
+        stats = [s if s is not None else _TreeStats(set(), set(), 0, 0) for s in stats]
+        
+        # Required nodes: duplicate entries count once per occurrence
+        names: Dict[Any, int] = {}
+        required_rows = []
+        for template in templates:
+            required = template.get("_required_nodes_set")
+            if required is None:
+                required = template.get("required_nodes", [])
+            required_rows.append([names.setdefault(name, len(names)) for name in required])
+        required = np.zeros((m, len(names)))
+        required_len = np.zeros(m)
+        for j, columns in enumerate(required_rows):
+            np.add.at(required[j], columns, 1.0)
+            required_len[j] = len(columns)
+        has_names = np.zeros((n, len(names)))
+        for i, s in enumerate(stats):
+            has_names[i, [names[name] for name in s.names if name in names]] = 1.0
+        found = has_names @ required.T
+        
+        # Expected roles: Jaccard overlap from intersection sizes
+        roles: Dict[Any, int] = {}
+        role_rows = []
+        for template in templates:
+            expected = template.get("_expected_roles_set")
+            if expected is None:
+                expected = set(template.get("expected_roles", []))
+            role_rows.append([roles.setdefault(role, len(roles)) for role in expected])
+        expected = np.zeros((m, len(roles)))
+        expected_len = np.array([len(columns) for columns in role_rows], dtype=float)
+        for j, columns in enumerate(role_rows):
+            expected[j, columns] = 1.0
+        has_roles = np.zeros((n, len(roles)))
+        for i, s in enumerate(stats):
+            has_roles[i, [roles[role] for role in s.roles if role in roles]] = 1.0
+        overlap = has_roles @ expected.T
+        tree_roles = np.array([len(s.roles) for s in stats], dtype=float)[:, None]
+        
+        # Structure: templates without depth/node_count take the tree's own
+        tree_depth = np.array([s.depth for s in stats], dtype=float)[:, None]
+        tree_count = np.array([s.count for s in stats], dtype=float)[:, None]
+        depth = self._template_column(templates, "depth", tree_depth)
+        count = self._template_column(templates, "node_count", tree_count)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            required_score = np.where(required_len == 0, 1.0, found / required_len)
+            role_score = np.where(expected_len == 0, 1.0,
+                                  np.where(tree_roles == 0, 0.0,
+                                           overlap / (tree_roles + expected_len - overlap)))
+            depth_similarity = 1.0 - np.abs(tree_depth - depth) / np.maximum(tree_depth, depth)
+            count_similarity = np.where((tree_count == 0) & (count == 0), 1.0,
+                                        1.0 - np.abs(tree_count - count) / np.maximum(tree_count, count))
+            structure_score = np.where((tree_depth == 0) & (depth == 0), 1.0,
+                                       (depth_similarity + count_similarity) / 2)
+        
+        scores = required_score * 0.4 + structure_score * 0.4 + role_score * 0.2
+        scores[~present, :] = 0.0
+        scores[:, [not template for template in templates]] = 0.0
+        return scores
+    
+    def find_best_matches(self, trees: List[Dict[str, Any]],
+                          templates: List[Dict[str, Any]]) -> List[Optional[Tuple[Dict[str, Any], float]]]:
+        """Run find_best_match for a batch of trees via score_matrix().
+        
+        Args:
+            trees: Normalized UI trees
+            templates: List of baseline templates
+            
+        Returns:
+            One find_best_match result per tree
+        """
+        if not templates:
+            return [None] * len(trees)
+        results: List[Optional[Tuple[Dict[str, Any], float]]] = []
+        for row in self.score_matrix(trees, templates):
+            best_template = None
+            best_score = 0.0
+            # First strictly greater score wins, as in find_best_match
+            for template, score in zip(templates, row):
+                if score > best_score:
+                    best_score = float(score)
+                    best_template = template
+            if best_score >= self.similarity_threshold:
+                results.append((best_template, best_score))
+            else:
+                results.append(None)
+        return results
+    
+    def _template_column(self, templates: List[Dict[str, Any]], key: str, tree_values: Any) -> Any:
+        """Broadcast a numeric template field to N x M, defaulting to the tree's value."""
+        has_value = np.array([key in template for template in templates])
+        values = np.array([template.get(key, 0) for template in templates], dtype=float)
+        return np.where(has_value, values, tree_values)
     
-    def _check_required_nodes(self, tree: Dict[str, Any], template: Dict[str, Any]) -> float:
+    def _check_required_nodes(self, tree: Dict[str, Any], template: Dict[str, Any],
+                              stats: Optional[_TreeStats] = None) -> float:
         """Check if required nodes are present in the tree."""
-        required_nodes = template.get("required_nodes", [])
+        required_set = template.get("_required_nodes_set")
+        required_nodes = required_set
+        if required_nodes is None:
+            required_nodes = template.get("required_nodes", [])
         if not required_nodes:
             return 1.0
         
         # Extract all node names from tree
-        tree_nodes = self._extract_node_names(tree)
+        tree_nodes = stats.names if stats is not None else self._extract_node_names(tree)
         
         # Count how many required nodes are present
-        found = sum(1 for node in required_nodes if node in tree_nodes)
+        if required_set is not None:
+            found = len(tree_nodes & required_set)
+        else:
+            found = sum(1 for node in required_nodes if node in tree_nodes)
         
         return found / len(required_nodes)
     
-    def _check_structure(self, tree: Dict[str, Any], template: Dict[str, Any]) -> float:
+    def _check_structure(self, tree: Dict[str, Any], template: Dict[str, Any],
+                         stats: Optional[_TreeStats] = None) -> float:
         """Check structural similarity."""
+        if stats is None:
+            stats = self._tree_stats(tree)
         # Compare tree depth
-        tree_depth = self._calculate_depth(tree.get("root"))
+        tree_depth = stats.depth
         template_depth = template.get("depth", tree_depth)  # Assume similar if not specified
         
         if tree_depth == 0 and template_depth == 0:
@@ -124,7 +372,7 @@ class Matcher:
         depth_similarity = 1.0 - abs(tree_depth - template_depth) / max(tree_depth, template_depth)
         
         # Compare node count
-        tree_count = self._count_nodes(tree.get("root"))
+        tree_count = stats.count
         template_count = template.get("node_count", tree_count)
         
         if tree_count == 0 and template_count == 0:
@@ -134,10 +382,13 @@ class Matcher:
         
         return (depth_similarity + count_similarity) / 2
     
-    def _check_roles(self, tree: Dict[str, Any], template: Dict[str, Any]) -> float:
+    def _check_roles(self, tree: Dict[str, Any], template: Dict[str, Any],
+                     stats: Optional[_TreeStats] = None) -> float:
         """Check if similar roles are present."""
-        tree_roles = self._extract_roles(tree.get("root"))
-        template_roles = set(template.get("expected_roles", []))
+        tree_roles = stats.roles if stats is not None else self._extract_roles(tree.get("root"))
+        template_roles = template.get("_expected_roles_set")
+        if template_roles is None:
+            template_roles = set(template.get("expected_roles", []))
         
         if not template_roles:
             return 1.0
@@ -150,64 +401,92 @@ class Matcher:
         
         return len(intersection) / len(union) if union else 1.0
     
-    def _extract_node_names(self, obj: Any, names: Optional[set] = None) -> set:
-        """Extract all node names from a tree."""
-        if names is None:
-            names = set()
+    def _tree_stats(self, tree: Dict[str, Any]) -> _TreeStats:
+        """Collect names, roles, depth and node count of a tree in one walk."""
+        if not self.cache_tree_stats:
+            return self._collect_tree_stats(tree)
+        cached = self._stats_cache.get(id(tree))
+        if cached is not None and cached[0] is tree:
+            return cached[1]
+        stats = self._collect_tree_stats(tree)
+        if len(self._stats_cache) >= self._STATS_CACHE_LIMIT:
+            self._stats_cache.clear()
+        self._stats_cache[id(tree)] = (tree, stats)
+        return stats
+    
+    def _collect_tree_stats(self, tree: Dict[str, Any]) -> _TreeStats:
+        """Walk a tree for its metrics, bypassing the cache."""
+        stats = self._walk(tree.get("root"))
+        if "root" not in tree:
+            # Bare node without the normalizer's wrapper: names come from it
+            return stats._replace(names=self._walk(tree).names)
+        if tree.get("name"):
+            stats.names.add(tree["name"])
+        return stats
+    
+    def _walk(self, root: Any) -> _TreeStats:
+        """Iterative pre-order walk computing all tree metrics at once.
         
+        Depth counts edges to the deepest node, including non-dict
+        children; only dict nodes are counted and contribute names/roles.
+        Nodes are read as dicts in place: converting to a typed node first
+        costs about three times the walk itself and saves only ~5% of it.
+        """
+        names: Set[Any] = set()
+        roles: Set[Any] = set()
+        max_depth = 0
+        count = 0
+        stack = [(root, 0)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, depth = pop()
+            if depth > max_depth:
+                max_depth = depth
+            if not isinstance(node, dict):
+                continue
+            count += 1
+            name = node.get("name")
+            if name:
+                names.add(name)
+            role = node.get("role")
+            if role:
+                roles.add(role)
+            child_depth = depth + 1
+            for child in node.get("children") or ():
+                push((child, child_depth))
+        return _TreeStats(names, roles, max_depth, count)
+    
+    def _extract_node_names(self, obj: Any) -> set:
+        """Extract all node names from a tree."""
         if isinstance(obj, dict):
-            if "name" in obj and obj["name"]:
-                names.add(obj["name"])
-            if "root" in obj:
-                self._extract_node_names(obj["root"], names)
-            if "children" in obj:
-                for child in obj.get("children", []):
-                    self._extract_node_names(child, names)
-        elif isinstance(obj, list):
-            for item in obj:
-                self._extract_node_names(item, names)
-        
-        return names
-    
-    def _extract_roles(self, node: Optional[Dict[str, Any]], roles: Optional[set] = None) -> set:
+            return self._tree_stats(obj).names
+        return self._walk(obj).names
+    
+    def _extract_roles(self, node: Optional[Dict[str, Any]]) -> set:
         """Extract all roles from a tree."""
-        if roles is None:
-            roles = set()
-        
-        if not isinstance(node, dict):
-            return roles
-        
-        if "role" in node and node["role"]:
-            roles.add(node["role"])
-        
-        for child in node.get("children", []):
-            self._extract_roles(child, roles)
-        
-        return roles
+        return self._walk(node).roles
     
-    def _calculate_depth(self, node: Optional[Dict[str, Any]], current_depth: int = 0) -> int:
-        """Calculate tree depth."""
-        if not isinstance(node, dict):
-            return current_depth
-        
-        children = node.get("children", [])
-        if not children:
-            return current_depth
-        
-        max_child_depth = max(
-            self._calculate_depth(child, current_depth + 1)
-            for child in children
-        )
+    def _calculate_depth(self, node: Optional[Dict[str, Any]]) -> int:
+        """Calculate tree depth.
         
-        return max_child_depth
+        Depth-only walk for standalone use; scoring reads depth from _walk.
+        """
+        max_depth = 0
+        stack = [(node, 0)]
+        pop = stack.pop
+        push_all = stack.extend
+        while stack:
+            node, depth = pop()
+            if depth > max_depth:
+                max_depth = depth
+            if isinstance(node, dict):
+                children = node.get("children")
+                if children:
+                    child_depth = depth + 1
+                    push_all([(child, child_depth) for child in children])
+        return max_depth
     
     def _count_nodes(self, node: Optional[Dict[str, Any]]) -> int:
         """Count total nodes in tree."""
-        if not isinstance(node, dict):
-            return 0
-        
-        count = 1  # Count this node
-        for child in node.get("children", []):
-            count += self._count_nodes(child)
-        
-        return count
+        return self._walk(node).count
@@ -1,8 +1,31 @@
 """Validate UI state transitions against templates."""
-from typing import Dict, Any, Optional, List, Tuple
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
 
+# Rabin-Karp parameters for loop detection: Mersenne prime modulus
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+def parse_transitions(valid_transitions: List[Any]) -> Tuple[Tuple[str, str], ...]:
+    """Split ``"A -> B"`` transition entries into ``(from, to)`` pairs.
+    
+    Entries without an arrow (plain target screen ids) are skipped. Only
+    the first arrow is split on, so a malformed ``"A -> B -> C"`` entry
+    keeps an arrow in its target for validation to report.
+    """
+    pairs = []
+    for transition in valid_transitions:
+        if not transition or not isinstance(transition, str):
+            continue
+        source, arrow, target = transition.partition(" -> ")
+        if arrow:
+            pairs.append((source, target))
+    return tuple(pairs)
+
+
 @dataclass
 class TransitionResult:
     """Result of a transition check."""
@@ -21,10 +44,19 @@ class TransitionChecker:
     - Manipulative dark patterns (forced flows)
     - Missing expected transitions
     """
+    # Intern tables are compacted to the ids still in history once they
+    # hold this many ids per history slot
+    _INTERN_SLACK = 4
     
     def __init__(self):
-        self._transition_history: List[Tuple[str, str, float]] = []
         self._max_history = 100
+        # Screen ids interned to small ints on first sight; history rows
+        # store the codes and are decoded only when read back
+        self._screen_codes: Dict[str, int] = {}
+        self._screen_ids: List[str] = []
+        # Ring buffer of (from_code, to_code, timestamp): appending past
+        # max_history evicts the oldest entry
+        self._transition_history: Deque[Tuple[int, int, float]] = deque(maxlen=self._max_history)
     
     def check_transition(self, from_id: str, to_id: str, 
                         templates: Optional[Dict[str, Dict[str, Any]]] = None) -> TransitionResult:
@@ -40,41 +72,46 @@ class TransitionChecker:
         """
         # Handle backward compatibility: if from_id is a dict, it's the old calling style
         if isinstance(from_id, dict):
-            from_template = from_id
-            if not from_template:
-                return TransitionResult(
-                    is_valid=True,
-                    reason="No source template (initial state)"
-                )
-            
-            from_screen_id = from_template.get("screen_id", "unknown")
-            valid_transitions = from_template.get("valid_transitions", [])
-            
-            # Empty valid_transitions means any transition is allowed
-            if not valid_transitions:
-                return TransitionResult(
-                    is_valid=True,
-                    reason="No transition restrictions"
-                )
-            
-            # Check if transition is in the valid list
-            for valid_transition in valid_transitions:
-                if valid_transition == to_id:
-                    return TransitionResult(
-                        is_valid=True,
-                        expected=valid_transitions,
-                        actual=to_id
-                    )
-            
-            # Transition not found in valid list
+            return self._check_from_template(from_id, to_id)
+        return self._check_from_screen(from_id, to_id, templates)
+    
+    def _check_from_template(self, from_template: Dict[str, Any], to_id: str) -> TransitionResult:
+        """Check a transition given the source template itself."""
+        if not from_template:
+            return TransitionResult(
+                is_valid=True,
+                reason="No source template (initial state)"
+            )
+        
+        from_screen_id = from_template.get("screen_id", "unknown")
+        valid_transitions = from_template.get("valid_transitions", [])
+        
+        # Empty valid_transitions means any transition is allowed
+        if not valid_transitions:
+            return TransitionResult(
+                is_valid=True,
+                reason="No transition restrictions"
+            )
+        
+        # Check if transition is in the valid list
+        if to_id in valid_transitions:
             return TransitionResult(
-                is_valid=False,
-                reason=f"Unexpected transition: {from_screen_id} -> {to_id}",
+                is_valid=True,
                 expected=valid_transitions,
                 actual=to_id
             )
         
-        # New calling style: from_id and to_id are strings, templates is dict
+        # Transition not found in valid list
+        return TransitionResult(
+            is_valid=False,
+            reason=f"Unexpected transition: {from_screen_id} -> {to_id}",
+            expected=valid_transitions,
+            actual=to_id
+        )
+    
+    def _check_from_screen(self, from_id: str, to_id: str,
+                           templates: Optional[Dict[str, Dict[str, Any]]]) -> TransitionResult:
+        """Check a transition given the source screen ID and a template lookup."""
         if templates is None:
             templates = {}
         
@@ -115,8 +152,10 @@ class TransitionChecker:
         Returns:
             True if transition is allowed
         """
-        result = self.check_transition(template, to_screen_id)
-        return result.is_valid
+        if not template:
+            return True
+        valid_transitions = template.get("valid_transitions", [])
+        return not valid_transitions or to_screen_id in valid_transitions
     
     def record_transition(self, from_screen_id: str, to_screen_id: str, 
                          timestamp: float) -> None:
@@ -127,11 +166,11 @@ class TransitionChecker:
             to_screen_id: Target screen ID
             timestamp: When transition occurred
         """
-        self._transition_history.append((from_screen_id, to_screen_id, timestamp))
-        
-        # Limit history size
-        if len(self._transition_history) > self._max_history:
-            self._transition_history.pop(0)
+        # Compact before interning so both codes of this row stay valid
+        if len(self._screen_ids) >= self._INTERN_SLACK * self._max_history:
+            self._compact_screen_codes()
+        self._transition_history.append(
+            (self._intern(from_screen_id), self._intern(to_screen_id), timestamp))
     
     def get_transition_history(self, count: int = 10) -> List[Tuple[str, str, float]]:
         """Get recent transition history.
@@ -142,7 +181,7 @@ class TransitionChecker:
         Returns:
             List of (from_screen_id, to_screen_id, timestamp) tuples
         """
-        return self._transition_history[-count:]
+        return self._recent(count)
     
     def detect_loops(self, window: int = 5) -> List[List[str]]:
         """Detect transition loops that might indicate dark patterns.
@@ -156,18 +195,20 @@ class TransitionChecker:
         if len(self._transition_history) < 3:
             return []
         
-        recent = self._transition_history[-window:]
-        loops = []
-        
-        # Look for repeated sequences
-        for i in range(len(recent) - 2):
-            for j in range(i + 2, len(recent)):
-                sequence = [t[0] for t in recent[i:j]]
-                # Check if sequence repeats
-                if self._is_repeating_sequence(sequence, recent[i:]):
-                    loops.append(sequence)
+        ids = [t[0] for t in list(self._transition_history)[-window:]]
+        n = len(ids)
+        # Every (start, length) window whose content recurs later in the window
+        repeats: List[Tuple[int, int]] = []
+        for length in range(2, n):
+            for start in self._recurring_windows(ids, length):
+                # Sequences must end before the last transition
+                if start + length < n:
+                    repeats.append((start, length))
+        repeats.sort()
         
-        return loops
+        screen_ids = self._screen_ids
+        return [[screen_ids[code] for code in ids[start:start + length]]
+                for start, length in repeats]
     
     def detect_forced_flow(self, templates: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Detect if user is being forced through a specific flow.
@@ -183,7 +224,7 @@ class TransitionChecker:
         if len(self._transition_history) < 3:
             return None
         
-        recent = self._transition_history[-5:]
+        recent = self._recent(5)
         flow = [t[0] for t in recent] + [recent[-1][1]]
         
         # Check if each screen in flow has limited options
@@ -223,18 +264,12 @@ class TransitionChecker:
         for screen_id, template in templates.items():
             screen_errors = []
             
-            valid_transitions = template.get("valid_transitions", [])
-            for transition in valid_transitions:
-                if not transition or " -> " not in transition:
-                    continue
-                
-                # Parse transition
-                parts = transition.split(" -> ")
-                if len(parts) != 2:
-                    screen_errors.append(f"Invalid transition format: {transition}")
+            for source, target_screen in parse_transitions(template.get("valid_transitions", [])):
+                if " -> " in target_screen:
+                    screen_errors.append(
+                        f"Invalid transition format: {source} -> {target_screen}")
                     continue
                 
-                target_screen = parts[1]
                 if target_screen not in templates:
                     screen_errors.append(f"Transition references unknown screen: {target_screen}")
             
@@ -243,18 +278,63 @@ class TransitionChecker:
         
         return errors
     
-    def _is_repeating_sequence(self, sequence: List[str], history: List[Tuple]) -> bool:
-        """Check if a sequence repeats in history."""
-        if len(sequence) < 2:
-            return False
+    def _intern(self, screen_id: str) -> int:
+        """Get the history code for a screen id, assigning one if new."""
+        code = self._screen_codes.get(screen_id)
+        if code is None:
+            code = self._screen_codes[screen_id] = len(self._screen_ids)
+            self._screen_ids.append(screen_id)
+        return code
+    
+    def _compact_screen_codes(self) -> None:
+        """Drop interned ids that no history row refers to any more.
+        
+        Rows are re-coded in place, so the tables stay proportional to
+        the history length even when every screen id is unique.
+        """
+        old_ids = self._screen_ids
+        self._screen_codes = {}
+        self._screen_ids = []
+        intern = self._intern
+        self._transition_history = deque(
+            ((intern(old_ids[from_code]), intern(old_ids[to_code]), timestamp)
+             for from_code, to_code, timestamp in self._transition_history),
+            maxlen=self._transition_history.maxlen)
+    
+    def _recent(self, count: int) -> List[Tuple[str, str, float]]:
+        """Get the newest ``count`` history entries as a list (slice semantics)."""
+        screen_ids = self._screen_ids
+        return [(screen_ids[from_code], screen_ids[to_code], timestamp)
+                for from_code, to_code, timestamp in list(self._transition_history)[-count:]]
+    
+    def _recurring_windows(self, ids: List[int], length: int) -> List[int]:
+        """Find start indices of windows that occur again further on.
         
-        # Convert history to screen IDs
-        screen_ids = [t[0] for t in history]
+        Rabin-Karp over interned screen ids: each length-``length`` window
+        gets a rolling hash in O(1), windows are bucketed by hash, and a
+        hash hit is confirmed with one slice compare to rule out collisions.
+        """
+        count = len(ids) - length + 1
+        if count < 2:
+            return []
         
-        # Count occurrences of sequence
-        count = 0
-        for i in range(len(screen_ids) - len(sequence) + 1):
-            if screen_ids[i:i+len(sequence)] == sequence:
-                count += 1
+        top = pow(_HASH_BASE, length - 1, _HASH_MOD)
+        hashes = [0] * count
+        h = 0
+        for k in range(length):
+            h = (h * _HASH_BASE + ids[k]) % _HASH_MOD
+        hashes[0] = h
+        for k in range(1, count):
+            h = ((h - ids[k - 1] * top) * _HASH_BASE + ids[k + length - 1]) % _HASH_MOD
+            hashes[k] = h
         
-        return count >= 2
+        # Scan right to left so each bucket holds only later starts
+        later: Dict[int, List[int]] = {}
+        recurring = []
+        for k in range(count - 1, -1, -1):
+            bucket = later.setdefault(hashes[k], [])
+            window = ids[k:k + length]
+            if any(ids[m:m + length] == window for m in bucket):
+                recurring.append(k)
+            bucket.append(k)
+        return recurring
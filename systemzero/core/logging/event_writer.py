@@ -3,11 +3,42 @@
 This writer maintains its own hash chain so standalone writes produce
 fully-formed log entries compatible with `ImmutableLog.verify_integrity()`.
 """
-from typing import Any, Optional, TextIO
+from typing import Any, BinaryIO, Dict, Optional
 import json
+import logging
+import os
 import time
+
+from core.utils import LogThrottle
 from .hash_chain import HashChain
 
+logger = logging.getLogger(__name__)
+_error_throttle = LogThrottle()
+
+try:
+    from orjson import dumps as _orjson_dumps
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    _orjson_dumps = None
+
+# fdatasync skips metadata that is not needed to read the data back (the
+# file size still is); it is missing on macOS and Windows
+_fsync = getattr(os, "fdatasync", os.fsync)
+
+
+def _json_line(entry: Dict[str, Any]) -> bytes:
+    """Encode a log entry as one compact JSON line of UTF-8 bytes."""
+    if _orjson_dumps is not None:
+        try:
+            line = _orjson_dumps(entry)
+        except TypeError:  # Values orjson rejects, e.g. non-str keys
+            pass
+        else:
+            # orjson writes NaN and +/-Infinity as null, but the entry hash
+            # covers the stdlib's NaN/Infinity; any null takes the stdlib path
+            if b"null" not in line:
+                return line + b"\n"
+    return (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+
 
 class EventWriter:
     """Writes events to a log file with optional formatting.
@@ -17,22 +48,61 @@ class EventWriter:
     - Append-only writes
     - Automatic flushing
     - Buffering for performance
+    
+    By default every write is flushed so readers see it immediately. For
+    high-volume streams pass ``auto_flush=False`` with ``flush_every``
+    and/or ``flush_secs`` to flush in batches instead; lines are held in a
+    large user-space buffer in between. Flushing hands data to the OS;
+    call sync() (or set ``fsync_on_close``) when it must reach the disk.
+    For durable streams ``sync_every`` group-commits: one fsync covers
+    every write since the previous one, and write_batch syncs once.
+    
+    Pass ``raw=True`` when several processes append to one file: the file
+    is opened unbuffered in append mode, so each line reaches the OS in a
+    single write() and lines from different writers do not interleave.
+    Each writer still keeps its own hash chain, so a shared file does not
+    verify as one chain.
+    
+    Args:
+        log_file: Path of the JSON lines log
+        auto_flush: Flush after every write unless ``flush_every`` is set
+        flush_every: Flush once this many writes are buffered
+        flush_secs: Flush on the first write this long after the last flush
+        fsync_on_close: fsync the file when closing it
+        sync_every: fsync once this many writes are not yet on disk
+        raw: Write each line straight to the OS, without user-space buffering
     """
+    # User-space write buffer; batched lines reach the OS in large writes
+    _BUFFER_SIZE = 1 << 20
     
-    def __init__(self, log_file: Optional[str] = None, auto_flush: bool = True):
+    def __init__(self, log_file: Optional[str] = None, auto_flush: bool = True,
+                 flush_every: Optional[int] = None, flush_secs: Optional[float] = None,
+                 fsync_on_close: bool = False, sync_every: Optional[int] = None,
+                 raw: bool = False):
         self.log_file = log_file
+        self.raw = raw
         self.auto_flush = auto_flush
-        self._file_handle: Optional[TextIO] = None
+        if flush_every is None and auto_flush:
+            flush_every = 1
+        self.flush_every = flush_every
+        self.flush_secs = flush_secs
+        self.fsync_on_close = fsync_on_close
+        self.sync_every = sync_every
+        self._file_handle: Optional[BinaryIO] = None
         self._write_count = 0
+        self._pending = 0
+        self._unsynced = 0
+        self._last_flush = time.monotonic()
         self._chain = HashChain()
         
         if log_file:
             self._open_file()
     
     def _open_file(self):
-        """Open log file in append mode."""
+        """Open log file in binary append mode; lines are written as UTF-8 bytes."""
         if self.log_file:
-            self._file_handle = open(self.log_file, 'a', encoding='utf-8')
+            buffering = 0 if self.raw else self._BUFFER_SIZE
+            self._file_handle = open(self.log_file, 'ab', buffering=buffering)
     
     def write(self, event: Any) -> bool:
         """Write an event to the log.
@@ -43,58 +113,21 @@ class EventWriter:
         Returns:
             True if write successful
         """
-        if not self._file_handle and not self.log_file:
-            # No file configured, skip
+        if not self._ensure_open():
             return False
         
-        if not self._file_handle:
-            self._open_file()
-        
         try:
-            # Convert event to dict if it has to_dict method
-            if hasattr(event, 'to_dict'):
-                event_dict = event.to_dict()
-            elif isinstance(event, dict):
-                event_dict = event
-            else:
-                event_dict = {"data": str(event), "timestamp": time.time()}
-            
-            # Enrich with timestamp and entry_id if missing
-            if isinstance(event_dict, dict):
-                if 'timestamp' not in event_dict:
-                    event_dict['timestamp'] = time.time()
-                if 'entry_id' not in event_dict:
-                    # Use a simple incrementing id for this writer instance
-                    event_dict['entry_id'] = f"evt_{self._write_count+1}"
-            
-            # Build hash-chained log entry matching ImmutableLog.append format
-            ts = event_dict.get('timestamp', time.time())
-            prev = self._chain.current_hash
-            entry_hash = self._chain.add_entry(event_dict, ts)
-            log_entry = {
-                "entry_hash": entry_hash,
-                "previous_hash": prev,
-                "timestamp": ts,
-                "data": event_dict,
-            }
-            
-            # Write as JSON line
-            json_line = json.dumps(log_entry, separators=(',', ':'))
-            self._file_handle.write(json_line + '\n')
-            
-            self._write_count += 1
-            
-            if self.auto_flush:
-                self._file_handle.flush()
-            
+            self._append(event)
+            self._maybe_flush()
             return True
         
         except Exception as e:
-            print(f"EventWriter error: {e}")
+            if _error_throttle.allow(str(e)):
+                logger.warning("EventWriter error: %s", e)
             return False
     
     def write_batch(self, events: list) -> int:
-        """Write multiple events.
+        """Write multiple events, flushing at most once at the end.
         
         Args:
             events: List of events to write
@@ -102,21 +135,107 @@ class EventWriter:
         Returns:
             Number of events successfully written
         """
+        if not self._ensure_open():
+            return 0
+        
         success_count = 0
         for event in events:
-            if self.write(event):
+            try:
+                self._append(event)
                 success_count += 1
+            except Exception as e:
+                if _error_throttle.allow(str(e)):
+                    logger.warning("EventWriter error: %s", e)
+        
+        try:
+            self._maybe_flush()
+        except OSError as e:
+            if _error_throttle.allow(str(e)):
+                logger.warning("EventWriter error: %s", e)
         return success_count
     
+    def _ensure_open(self) -> bool:
+        """Open the log file if needed; False if no file is configured."""
+        if not self._file_handle and not self.log_file:
+            # No file configured, skip
+            return False
+        
+        if not self._file_handle:
+            self._open_file()
+        return True
+    
+    def _append(self, event: Any) -> None:
+        """Chain and buffer one event without flushing."""
+        # Convert event to dict if it has to_dict method
+        if hasattr(event, 'to_dict'):
+            event_dict = event.to_dict()
+        elif isinstance(event, dict):
+            event_dict = event
+        else:
+            event_dict = {"data": str(event), "timestamp": time.time()}
+        
+        # Enrich with timestamp and entry_id if missing
+        if isinstance(event_dict, dict):
+            if 'timestamp' not in event_dict:
+                event_dict['timestamp'] = time.time()
+            if 'entry_id' not in event_dict:
+                # Use a simple incrementing id for this writer instance
+                event_dict['entry_id'] = f"evt_{self._write_count+1}"
+        
+        # Build hash-chained log entry matching ImmutableLog.append format
+        ts = event_dict.get('timestamp', time.time())
+        prev = self._chain.current_hash
+        entry_hash = self._chain.add_entry(event_dict, ts)
+        log_entry = {
+            "entry_hash": entry_hash,
+            "previous_hash": prev,
+            "timestamp": ts,
+            "data": event_dict,
+        }
+        
+        # Write as JSON line; an unbuffered (raw) file may take only part of it
+        line = _json_line(log_entry)
+        written = self._file_handle.write(line)
+        while written < len(line):
+            written += self._file_handle.write(memoryview(line)[written:])
+        
+        self._write_count += 1
+        self._pending += 1
+        self._unsynced += 1
+    
+    def _maybe_flush(self) -> None:
+        """Sync or flush if the buffered writes hit a count or age limit."""
+        if self.sync_every is not None and self._unsynced >= self.sync_every:
+            self.sync()
+            return
+        if not self._pending:
+            return
+        if ((self.flush_every is not None and self._pending >= self.flush_every)
+                or (self.flush_secs is not None
+                    and time.monotonic() - self._last_flush >= self.flush_secs)):
+            self.flush()
+    
     def flush(self):
-        """Flush buffered writes to disk."""
+        """Flush buffered writes to the OS."""
         if self._file_handle:
             self._file_handle.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def sync(self):
+        """Flush buffered writes and fsync them to disk."""
+        if self._file_handle:
+            self.flush()
+            _fsync(self._file_handle.fileno())
+        self._unsynced = 0
     
     def close(self):
         """Close the log file."""
         if self._file_handle:
-            self._file_handle.flush()
+            if self.fsync_on_close:
+                self.sync()
+            else:
+                self.flush()
             self._file_handle.close()
             self._file_handle = None
     
@@ -1,4 +1,5 @@
 """Immutable append-only log with hash chain integrity."""
+from bisect import bisect_left, bisect_right
 from typing import Optional, List, Dict, Any
 import json
 from pathlib import Path
@@ -7,6 +8,26 @@ import time
 from .hash_chain import HashChain
 from .event_writer import EventWriter
 
+try:
+    from orjson import loads as _orjson_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _orjson_loads = None
+
+
+def _parse_line(line: bytes) -> Any:
+    """Parse one JSON log line.
+    
+    orjson rejects a few things the stdlib accepts (NaN literals, integers
+    beyond 64 bits); those lines are retried with json.loads, whose
+    JSONDecodeError is what callers handle.
+    """
+    if _orjson_loads is not None:
+        try:
+            return _orjson_loads(line)
+        except ValueError:
+            pass
+    return json.loads(line)
+
 
 class ImmutableLog:
     """Immutable append-only log with cryptographic integrity.
@@ -16,6 +37,11 @@ class ImmutableLog:
     - Hash chain for tamper detection
     - JSON line format for easy parsing
     - Automatic integrity verification
+    
+    Lookups by hash use an index kept in step with the entries; search()
+    indexes an event data key the first time it is queried, and entry
+    timestamps are kept as a column for time-range queries. Entries are
+    append-only and must not be mutated in place.
     """
     
     def __init__(self, path: str, verify_on_load: bool = True):
@@ -31,6 +57,14 @@ class ImmutableLog:
         
         # Load existing entries if file exists
         self._entries: List[Dict[str, Any]] = []
+        # entry_hash -> first entry with it
+        self._by_hash: Dict[str, Dict[str, Any]] = {}
+        # data key -> value -> entries, built on first search by that key
+        self._indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        # Timestamp column parallel to _entries (None where not numeric);
+        # binary-searchable while appends arrive in time order
+        self._timestamps: List[Optional[float]] = []
+        self._time_ordered = True
         if self.path.exists():
             self._load_existing()
     
@@ -70,7 +104,7 @@ class ImmutableLog:
         self.writer.write(log_entry)
         
         # Add to in-memory cache
-        self._entries.append(log_entry)
+        self._add_entry(log_entry)
         
         return entry_hash
     
@@ -110,10 +144,23 @@ class ImmutableLog:
         Returns:
             Entry dict or None if not found
         """
-        for entry in self._entries:
-            if entry.get('entry_hash') == entry_hash:
-                return entry
-        return None
+        return self._by_hash.get(entry_hash)
+    
+    def get_entries_between(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Get entries whose timestamp lies in ``[start, end]``.
+        
+        Args:
+            start: Earliest timestamp to include
+            end: Latest timestamp to include
+            
+        Returns:
+            Matching entries in log order
+        """
+        timestamps = self._timestamps
+        if self._time_ordered:
+            return self._entries[bisect_left(timestamps, start):bisect_right(timestamps, end)]
+        return [entry for entry, ts in zip(self._entries, timestamps)
+                if ts is not None and start <= ts <= end]
     
     def get_entry_count(self) -> int:
         """Get total number of entries in log."""
@@ -128,42 +175,101 @@ class ImmutableLog:
         Returns:
             List of matching entries
         """
+        candidates = self._entries
+        for key, value in criteria.items():
+            try:
+                candidates = self._index(key).get(value, [])
+            except TypeError:  # Unhashable value: scan instead
+                continue
+            break
+        
         matches = []
-        for entry in self._entries:
+        for entry in candidates:
             event_data = entry.get('data', {})
             if all(event_data.get(k) == v for k, v in criteria.items()):
                 matches.append(entry)
         return matches
     
+    def _index(self, key: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """Get the value -> entries index for an event data key."""
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = {}
+            for entry in self._entries:
+                self._index_entry(index, key, entry)
+        return index
+    
+    def _index_entry(self, index: Dict[Any, List[Dict[str, Any]]], key: str,
+                     entry: Dict[str, Any]) -> None:
+        """Add one entry to a data key index; unhashable values are left out."""
+        data = entry.get('data', {}) if isinstance(entry, dict) else None
+        if not isinstance(data, dict):
+            return
+        try:
+            index.setdefault(data.get(key), []).append(entry)
+        except TypeError:
+            pass
+    
+    def _add_entry(self, entry: Dict[str, Any]) -> None:
+        """Append an entry to the in-memory log and its indexes."""
+        self._entries.append(entry)
+        if not isinstance(entry, dict):
+            # Malformed line loaded from disk (e.g. a bare JSON array)
+            self._timestamps.append(None)
+            self._time_ordered = False
+            return
+        ts = entry.get('timestamp')
+        if not isinstance(ts, (int, float)) or isinstance(ts, bool) or ts != ts:
+            ts = None  # Missing, non-numeric or NaN
+        timestamps = self._timestamps
+        if self._time_ordered and (ts is None or (timestamps and ts < timestamps[-1])):
+            self._time_ordered = False
+        timestamps.append(ts)
+        entry_hash = entry.get('entry_hash')
+        if isinstance(entry_hash, str):
+            self._by_hash.setdefault(entry_hash, entry)
+        for key, index in self._indexes.items():
+            self._index_entry(index, key, entry)
+    
     def _load_existing(self):
-        """Load existing log entries from file."""
+        """Load existing log entries from file.
+        
+        The file is read in one call and parsed line by line from bytes,
+        with orjson when it is installed.
+        """
         if not self.path.exists():
             return
         
         try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                for line in f:
+            head = None
+            linked = 0
+            try:
+                for line in self.path.read_bytes().splitlines():
                     line = line.strip()
                     if not line:
                         continue
                     
                     try:
-                        entry = json.loads(line)
+                        entry = _parse_line(line)
                         # Normalize: if raw event dict (no 'data' key), wrap it
                         if isinstance(entry, dict) and 'data' not in entry:
                             normalized = {"data": entry}
                         else:
                             normalized = entry
-                        self._entries.append(normalized)
+                        self._add_entry(normalized)
                         
-                        # Update hash chain state
+                        # Track hash chain state; applied once below
                         if 'entry_hash' in normalized:
-                            self.hash_chain.current_hash = normalized['entry_hash']
-                            self.hash_chain._chain_length += 1
+                            head = normalized['entry_hash']
+                            linked += 1
                     
                     except json.JSONDecodeError as e:
                         print(f"Error parsing log entry: {e}")
                         self._load_error = True
+            finally:
+                if linked:
+                    self.hash_chain.current_hash = head
+                    self.hash_chain._chain_length += linked
             
             # Verify integrity if requested
             if self.verify_on_load and not self.verify_integrity():
@@ -1,5 +1,5 @@
 """UI node classification for semantic analysis."""
-from typing import Dict, Any, Set
+from typing import Dict, Any, FrozenSet
 
 
 class NodeClassifier:
@@ -15,28 +15,37 @@ class NodeClassifier:
     """
     
     def __init__(self):
-        self._interactive_roles: Set[str] = {
+        self._interactive_roles: FrozenSet[str] = frozenset({
             "button", "link", "menuitem", "tab", "checkbox",
             "radio", "switch", "slider", "textbox"
-        }
-        self._content_roles: Set[str] = {
+        })
+        self._content_roles: FrozenSet[str] = frozenset({
             "text", "label", "heading", "paragraph",
             "image", "icon", "statictext"
-        }
-        self._container_roles: Set[str] = {
+        })
+        self._container_roles: FrozenSet[str] = frozenset({
             "window", "pane", "panel", "group",
             "container", "scroll_pane", "splitpane", "frame"
-        }
-        self._navigation_roles: Set[str] = {
+        })
+        self._navigation_roles: FrozenSet[str] = frozenset({
             "menu", "menubar", "toolbar", "tablist",
             "navigation", "tree"
-        }
-        self._input_roles: Set[str] = {
+        })
+        self._input_roles: FrozenSet[str] = frozenset({
             "text_field", "textarea", "combobox",
             "spinbutton", "searchbox"
-        }
+        })
         # Map for backward compatibility
-        self._static_roles: Set[str] = self._content_roles
+        self._static_roles: FrozenSet[str] = self._content_roles
+        # role -> category in one lookup; later updates take precedence,
+        # matching the order classify() used to test the sets in
+        self._role_categories: Dict[str, str] = {}
+        for roles, category in ((self._container_roles, "container"),
+                                (self._input_roles, "input"),
+                                (self._navigation_roles, "navigation"),
+                                (self._content_roles, "content"),
+                                (self._interactive_roles, "interactive")):
+            self._role_categories.update(dict.fromkeys(roles, category))
     
     def classify(self, node: Dict[str, Any]) -> str:
         """Classify a UI node into a semantic category.
@@ -51,20 +60,14 @@ class NodeClassifier:
             return "unknown"
         
         role = node.get("role", "").lower()
-        node_type = node.get("type", "").lower()
-        name = node.get("name", "").lower()
         
         # Check role-based classification first
-        if role in self._interactive_roles:
-            return "interactive"
-        if role in self._content_roles or role in self._static_roles:
-            return "content" if role in self._content_roles else "static"
-        if role in self._navigation_roles:
-            return "navigation"
-        if role in self._input_roles:
-            return "input"
-        if role in self._container_roles:
-            return "container"
+        category = self._role_categories.get(role)
+        if category is not None:
+            return category
+        
+        node_type = node.get("type", "").lower()
+        name = node.get("name", "").lower()
         
         # Fallback to type-based classification
         if "button" in node_type or "button" in name:
@@ -101,15 +104,23 @@ class NodeClassifier:
         return interactive
     
     def _collect_by_classification(self, node: Any, target_class: str, result: list):
-        """Recursively collect nodes of a specific classification."""
-        if not isinstance(node, dict):
-            return
-        
-        if self.classify(node) == target_class:
-            result.append(node)
+        """Collect nodes of a specific classification in pre-order.
         
-        # Recurse into children
-        children = node.get("children", [])
-        if isinstance(children, list):
-            for child in children:
-                self._collect_by_classification(child, target_class, result)
+        Iterative, so deep trees cannot hit the recursion limit.
+        """
+        classify = self.classify
+        stack = [node]
+        pop = stack.pop
+        push_all = stack.extend
+        while stack:
+            node = pop()
+            if not isinstance(node, dict):
+                continue
+            
+            if classify(node) == target_class:
+                result.append(node)
+            
+            # Push children reversed so they pop in document order
+            children = node.get("children", [])
+            if isinstance(children, list) and children:
+                push_all(reversed(children))
@@ -1,6 +1,6 @@
 """Filters for removing noise from UI trees."""
-from typing import Dict, Any, Optional, Set
-import copy
+import re
+from typing import Dict, Any, Optional, Pattern, Set
 
 
 class NoiseFilters:
@@ -22,6 +22,7 @@ class NoiseFilters:
         self._noise_names: Set[str] = {
             "loading", "spinner", "dots", "ellipsis"
         }
+        self._noise_name_pattern = self._compile_noise_names()
         self.filter_invisible = True
         self.filter_zero_size = True
         self.filter_decorative = True
@@ -33,12 +34,14 @@ class NoiseFilters:
             tree: Normalized UI tree
             
         Returns:
-            Filtered tree with noise elements removed
+            Filtered tree with noise elements removed. The input is not
+            modified: surviving nodes and their children lists are new,
+            other values (properties, bounds) are shared with the input.
         """
         if not tree:
             return tree
         
-        filtered = copy.deepcopy(tree)
+        filtered = tree.copy()
         
         # Filter the root node and its children
         if "root" in filtered:
@@ -47,7 +50,10 @@ class NoiseFilters:
         return filtered
     
     def _filter_node(self, node: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Recursively filter a single node."""
+        """Recursively filter a single node into a copy of the survivors.
+        
+        Filtered subtrees are skipped without being copied.
+        """
         if not node or not isinstance(node, dict):
             return node
         
@@ -55,31 +61,36 @@ class NoiseFilters:
         if self._should_filter(node):
             return None
         
-        # Filter children recursively
-        if "children" in node and isinstance(node["children"], list):
-            filtered_children = [
-                self._filter_node(child) for child in node["children"]
-            ]
-            # Remove None entries
-            node["children"] = [c for c in filtered_children if c is not None]
+        filtered = node.copy()
+        children = node.get("children")
+        if isinstance(children, list):
+            filtered_children = []
+            for child in children:
+                child = self._filter_node(child)
+                # Drop filtered-out children
+                if child is not None:
+                    filtered_children.append(child)
+            filtered["children"] = filtered_children
         
-        return node
+        return filtered
     
     def _should_filter(self, node: Dict[str, Any]) -> bool:
         """Determine if a node should be filtered out."""
         role = node.get("role", "").lower()
-        name = node.get("name", "").lower()
-        properties = node.get("properties", {})
-        bounds = node.get("bounds", {})
         
         # Filter by role
         if role in self._noise_roles:
             return True
         
         # Filter by name patterns
-        if any(noise in name for noise in self._noise_names):
+        name = node.get("name", "").lower()
+        pattern = self._noise_name_pattern
+        if pattern is not None and pattern.search(name):
             return True
         
+        properties = node.get("properties", {})
+        bounds = node.get("bounds", {})
+        
         # Filter invisible elements
         if self.filter_invisible and isinstance(properties, dict):
             if not properties.get("visible", True):
@@ -125,3 +136,15 @@ class NoiseFilters:
     def add_noise_name(self, name: str):
         """Add a name pattern to the noise filter list."""
         self._noise_names.add(name.lower())
+        self._noise_name_pattern = self._compile_noise_names()
+    
+    def _compile_noise_names(self) -> Optional[Pattern[str]]:
+        """Compile the noise name substrings into one alternation.
+        
+        One regex search scans a name once instead of once per pattern;
+        None when there are no patterns (an empty alternation would match
+        every name).
+        """
+        if not self._noise_names:
+            return None
+        return re.compile("|".join(map(re.escape, sorted(self._noise_names))))
@@ -3,6 +3,12 @@ import hashlib
 import json
 from typing import Dict, Any, List, Set
 
+# json.dumps builds a new encoder per call when given options; reuse one
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
+# Exact types _canonicalize returns unchanged; checked inline to skip a call
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
 
 class SignatureGenerator:
     """Generates deterministic cryptographic signatures from normalized UI trees.
@@ -35,7 +41,7 @@ class SignatureGenerator:
         canonical = self._canonicalize(normalized_tree)
         
         # Convert to deterministic JSON
-        json_str = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+        json_str = _CANONICAL_ENCODER.encode(canonical)
         
         # Generate hash
         return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
@@ -49,7 +55,7 @@ class SignatureGenerator:
             return hashlib.sha256(b"").hexdigest()
         
         structure = self._extract_structure(normalized_tree)
-        json_str = json.dumps(structure, sort_keys=True, separators=(',', ':'))
+        json_str = _CANONICAL_ENCODER.encode(structure)
         return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
     
     def generate_content(self, normalized_tree: Dict[str, Any]) -> str:
@@ -66,16 +72,19 @@ class SignatureGenerator:
     
     def _canonicalize(self, obj: Any) -> Any:
         """Create a canonical representation for hashing."""
+        canonicalize = self._canonicalize
+        primitive_types = _PRIMITIVE_TYPES
         if isinstance(obj, dict):
-            canonical = {}
-            for key, value in obj.items():
-                # Skip ignored properties
-                if key in self._ignore_properties:
-                    continue
-                canonical[key] = self._canonicalize(value)
-            return canonical
+            # Skip ignored properties; leaf values are copied without a call
+            ignore = self._ignore_properties
+            return {
+                key: value if type(value) in primitive_types else canonicalize(value)
+                for key, value in obj.items()
+                if key not in ignore
+            }
         elif isinstance(obj, list):
-            return [self._canonicalize(item) for item in obj]
+            return [item if type(item) in primitive_types else canonicalize(item)
+                    for item in obj]
         elif isinstance(obj, (str, int, float, bool, type(None))):
             return obj
         else:
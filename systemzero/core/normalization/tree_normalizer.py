@@ -1,6 +1,21 @@
 """UI tree normalization for consistent comparison."""
 from typing import Dict, Any, List, Optional
 import copy
+import sys
+
+# Values of these exact types are immutable and can be shared with the input
+_IMMUTABLE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Properties drawn from a small vocabulary that repeats across nodes and
+# captures; their string values are interned so equal values share one object
+_INTERNED_PROPS = frozenset({"role", "type"})
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy a non-node value so the normalized tree shares nothing mutable."""
+    if type(value) in _IMMUTABLE_TYPES:
+        return value
+    return copy.deepcopy(value)
 
 
 class TreeNormalizer:
@@ -34,23 +49,22 @@ class TreeNormalizer:
         if not tree:
             return {}
         
-        normalized = copy.deepcopy(tree)
-        
-        # Extract and normalize the root node
-        if "root" in normalized:
-            normalized["root"] = self._normalize_node(normalized["root"])
-        
-        # Remove transient top-level properties
-        for prop in list(normalized.keys()):
-            if prop in self._transient_props:
-                del normalized[prop]
+        # Build the result directly from the input; nodes are rebuilt by
+        # _normalize_node, so only leaf values need copying
+        normalized = {}
+        for key, value in tree.items():
+            # Remove transient top-level properties
+            if key in self._transient_props:
+                continue
+            # Extract and normalize the root node
+            normalized[key] = self._normalize_node(value) if key == "root" else _copy_value(value)
         
         return normalized
     
     def _normalize_node(self, node: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Recursively normalize a single node."""
         if not node or not isinstance(node, dict):
-            return node
+            return _copy_value(node)
         
         normalized = {}
         
@@ -72,8 +86,10 @@ class TreeNormalizer:
                 normalized["children"] = self._sort_children(normalized_children)
             elif isinstance(value, dict):
                 normalized[standard_key] = self._normalize_node(value)
+            elif standard_key in _INTERNED_PROPS and type(value) is str:
+                normalized[standard_key] = sys.intern(value)
             else:
-                normalized[standard_key] = value
+                normalized[standard_key] = _copy_value(value)
         
         return normalized
     
@@ -72,6 +72,8 @@ class HealthChecker:
         """
         results = []
         overall_status = HealthStatus.HEALTHY
+        # One timestamp for the whole run; formatting it per check adds up
+        now = datetime.now(timezone.utc).isoformat()
         
         for check_func in self._checks:
             try:
@@ -91,13 +93,13 @@ class HealthChecker:
                     "status": HealthStatus.UNHEALTHY.value,
                     "message": f"Check failed: {str(e)}",
                     "details": {"exception": traceback.format_exc()},
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": now,
                 })
                 overall_status = HealthStatus.UNHEALTHY
         
         return {
             "status": overall_status.value,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now,
             "checks": results,
         }
     
@@ -1,12 +1,14 @@
 """Metrics collection for System//Zero - counters, histograms, gauges."""
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 import threading
 
 
 class MetricsCollector:
     """In-memory metrics collector for API observability."""
+    # Observations kept per histogram; older ones drop out as new arrive
+    _HISTOGRAM_LIMIT = 10000
     
     def __init__(self):
         """Initialize metrics storage."""
@@ -15,8 +17,10 @@ class MetricsCollector:
         # Counters: incrementing values
         self._counters: Dict[str, int] = defaultdict(int)
         
-        # Histograms: list of observations for percentile calculation
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
+        # Histograms: most recent observations for percentile calculation
+        self._histograms: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self._HISTOGRAM_LIMIT)
+        )
         
         # Gauges: current value (can increase/decrease)
         self._gauges: Dict[str, float] = {}
@@ -46,11 +50,8 @@ class MetricsCollector:
         """
         key = self._make_key(name, labels)
         with self._lock:
+            # Bounded deque: appending past the limit drops the oldest
             self._histograms[key].append(value)
-            
-            # Limit histogram size to prevent memory issues
-            if len(self._histograms[key]) > 10000:
-                self._histograms[key] = self._histograms[key][-10000:]
     
     def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """Set a gauge metric to a specific value.
@@ -99,12 +100,13 @@ class MetricsCollector:
             for key, observations in self._histograms.items():
                 if observations:
                     sorted_obs = sorted(observations)
+                    total = sum(observations)
                     histogram_stats[key] = {
                         "count": len(observations),
-                        "sum": sum(observations),
+                        "sum": total,
                         "min": sorted_obs[0],
                         "max": sorted_obs[-1],
-                        "mean": sum(observations) / len(observations),
+                        "mean": total / len(observations),
                         "p50": self._percentile(sorted_obs, 0.50),
                         "p95": self._percentile(sorted_obs, 0.95),
                         "p99": self._percentile(sorted_obs, 0.99),
@@ -2,5 +2,6 @@ from .hashing import sha256
 from .timestamps import now
 from .config import get_config
 from .constants import DRIFT_TYPES
+from .log_throttle import LogThrottle
 
-__all__ = ["sha256", "now", "get_config", "DRIFT_TYPES"]
+__all__ = ["sha256", "now", "get_config", "DRIFT_TYPES", "LogThrottle"]
@@ -0,0 +1,32 @@
+"""Suppress repeated log messages on hot error paths."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class LogThrottle:
+    """Allows a given message key at most once per interval.
+
+    Keys are kept in a small LRU so a flood of distinct errors cannot grow
+    memory without bound.
+    """
+
+    def __init__(self, interval: float = 60.0, maxsize: int = 128):
+        self.interval = interval
+        self.maxsize = maxsize
+        self._last_seen: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: Hashable) -> bool:
+        """Return True if ``key`` has not been allowed within the interval."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_seen.get(key)
+            if last is not None and now - last < self.interval:
+                return False
+            self._last_seen[key] = now
+            self._last_seen.move_to_end(key)
+            if len(self._last_seen) > self.maxsize:
+                self._last_seen.popitem(last=False)
+            return True
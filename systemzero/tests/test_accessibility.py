@@ -1,7 +1,7 @@
 """Tests for accessibility layer."""
 import pytest
 import time
-from core.accessibility import EventStream, TreeCapture, AccessibilityListener
+from core.accessibility import EventStream, TreeCapture, AccessibilityListener, UIEvent
 
 
 class TestEventStream:
@@ -34,6 +34,39 @@ class TestEventStream:
         time.sleep(0.1)  # Give callback time to execute
         assert len(received) == 1
     
+    def test_subscribe_from_listener(self):
+        """Test that a listener may subscribe during dispatch without deadlock."""
+        stream = EventStream()
+        late = []
+
+        def first(event):
+            if not late:
+                stream.subscribe(late.append)
+                late.append("subscribed")
+
+        stream.subscribe(first)
+        stream.push({"id": 1})
+        # The late subscriber joins from the next push onwards
+        assert late == ["subscribed"]
+        stream.push({"id": 2})
+        assert late == ["subscribed", {"id": 2}]
+
+    def test_listener_errors_logged_once(self, caplog):
+        """Test that a repeatedly failing listener is logged, not printed per event."""
+        stream = EventStream()
+
+        def broken(event):
+            raise ValueError("listener exploded")
+
+        stream.subscribe(broken)
+        with caplog.at_level("WARNING", logger="core.accessibility.event_stream"):
+            for i in range(5):
+                stream.push({"id": i})
+
+        messages = [r.getMessage() for r in caplog.records if "listener exploded" in r.getMessage()]
+        assert len(messages) == 1
+        assert len(stream.get_recent(10)) == 5
+
     def test_maxlen_limit(self):
         """Test that stream respects maxlen."""
         stream = EventStream(maxlen=5)
@@ -43,6 +76,46 @@ class TestEventStream:
         recent = stream.get_recent(10)
         assert len(recent) <= 5
     
+    def test_get_recent_order_after_wrap(self):
+        """Test that recent events stay ordered once the ring wraps."""
+        stream = EventStream(maxlen=5)
+        for i in range(23):
+            stream.push({"id": i})
+
+        assert [e["id"] for e in stream.get_recent(3)] == [20, 21, 22]
+        assert [e["id"] for e in stream.get_recent(10)] == [18, 19, 20, 21, 22]
+
+    def test_unbounded_stream_grows(self):
+        """Test that maxlen=None keeps every event."""
+        stream = EventStream(maxlen=None)
+        for i in range(500):
+            stream.push({"id": i})
+
+        recent = stream.get_recent(1000)
+        assert len(recent) == 500
+        assert recent[0]["id"] == 0
+        assert recent[-1]["id"] == 499
+
+    def test_concurrent_producers(self):
+        """Test that lock-free pushes from several threads are all kept."""
+        import threading
+
+        stream = EventStream(maxlen=4096)
+
+        def produce(base):
+            for i in range(500):
+                stream.push({"id": base + i})
+
+        threads = [threading.Thread(target=produce, args=(n * 1000,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        recent = stream.get_recent(4096)
+        assert len(recent) == 2000
+        assert len({e["id"] for e in recent}) == 2000
+
     def test_clear(self):
         """Test clearing the stream."""
         stream = EventStream()
@@ -112,6 +185,66 @@ class TestAccessibilityListener:
         assert len(recent) == 1
         assert recent[0]["data"]["type"] == "window_focus"
     
+    def test_on_event_pushes_ui_event(self):
+        """Test that enriched events are slotted UIEvent records."""
+        stream = EventStream()
+        listener = AccessibilityListener(stream)
+        listener.on_event({"type": "text_change", "source": "atspi"})
+
+        event = stream.get_recent(1)[0]
+        assert isinstance(event, UIEvent)
+        assert not hasattr(event, "__dict__")
+        assert event.type == "text_change"
+        assert event.source == "atspi"
+        assert event.to_dict()["data"] == {"type": "text_change", "source": "atspi"}
+        with pytest.raises(KeyError):
+            event["window"]
+
+    def test_ui_event_supports_dict_style_reads(self):
+        """Test get(), membership and a plain-dict to_dict() for former dict consumers."""
+        from types import MappingProxyType
+        payload = MappingProxyType({"type": "focus"})
+        event = UIEvent("focus", 1.0, "atspi", payload)
+
+        assert event.get("source") == "atspi"
+        assert event.get("window") is None
+        assert event.get("window", "n/a") == "n/a"
+        assert "data" in event and "window" not in event
+        data = event.to_dict()["data"]
+        assert type(data) is dict and data == {"type": "focus"}
+
+    def test_on_event_uses_supplied_timestamp(self):
+        """Test that a batch timestamp is used instead of reading the clock."""
+        stream = EventStream()
+        listener = AccessibilityListener(stream)
+        listener.on_event({"type": "a"}, now=123.5)
+        listener.on_event({"type": "b"})
+
+        first, second = stream.get_recent(2)
+        assert first.timestamp == 123.5
+        assert second.timestamp > 123.5
+
+    def test_polled_events_can_be_logged(self):
+        """Test that mock poll events go through EventWriter and ImmutableLog."""
+        import tempfile
+        from pathlib import Path
+        from core.logging import EventWriter, ImmutableLog
+
+        stream = EventStream()
+        listener = AccessibilityListener(stream)
+        listener.on_event(AccessibilityListener._MOCK_EVENT, now=1.0)
+        event = stream.get_recent(1)[0]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = EventWriter(str(Path(tmp) / "writer.log"))
+            assert writer.write(event)
+            writer.close()
+
+            log = ImmutableLog(str(Path(tmp) / "immutable.log"))
+            log.append(event)
+            assert log.get_entries()[0]["data"]["data"]["window_title"] == "Mock Application"
+            assert ImmutableLog(str(Path(tmp) / "writer.log")).verify_integrity()
+
     def test_start_stop(self):
         """Test starting and stopping listener."""
         stream = EventStream()
@@ -1,4 +1,5 @@
 """Tests for baseline layer."""
+import json
 import pytest
 from pathlib import Path
 from core.baseline import TemplateLoader, TemplateValidator, StateMachine
@@ -34,6 +35,78 @@ class TestTemplateLoader:
             assert template is not None
             assert template["screen_id"] == first_id
 
+    def test_load_returns_private_copy(self, tmp_path):
+        """Test that mutating a loaded template does not leak into later loads."""
+        path = tmp_path / "screen.yaml"
+        path.write_text("screen_id: screen\nrequired_nodes: [a]\n")
+        loader = TemplateLoader(str(tmp_path))
+
+        first = loader.load(str(path))
+        first["required_nodes"].append("b")
+        second = loader.load(str(path))
+        assert second["required_nodes"] == ["a"]
+
+    def test_load_picks_up_file_changes(self, tmp_path):
+        """Test that editing a template invalidates the parse cache."""
+        path = tmp_path / "screen.yaml"
+        path.write_text("screen_id: before\n")
+        loader = TemplateLoader(str(tmp_path))
+        assert loader.load(str(path))["screen_id"] == "before"
+
+        path.write_text("screen_id: after_edit\n")
+        assert loader.load(str(path))["screen_id"] == "after_edit"
+
+    def test_compile_cache_writes_json_sidecar(self, tmp_path):
+        """Test that compile_cache keeps a JSON sidecar in sync with the YAML."""
+        path = tmp_path / "screen.yaml"
+        path.write_text("screen_id: compiled\nrequired_nodes: [a, b]\n")
+        loader = TemplateLoader(str(tmp_path), compile_cache=True)
+
+        template = loader.load(str(path))
+        sidecar = tmp_path / "screen.yaml.cache.json"
+        assert sidecar.exists()
+        assert json.loads(sidecar.read_text())["template"] == template
+
+        # A fresh loader reads the same content
+        assert TemplateLoader(str(tmp_path), compile_cache=True).load_all() == {"compiled": template}
+
+    def test_compile_cache_skips_templates_with_non_str_keys(self, tmp_path):
+        """Test that templates JSON cannot represent exactly get no sidecar."""
+        path = tmp_path / "screen.yaml"
+        path.write_text("screen_id: keyed\nthresholds: {1: low, true: high}\n")
+
+        template = TemplateLoader(str(tmp_path), compile_cache=True).load(str(path))
+        assert template["thresholds"] == {1: "low", True: "high"}
+        assert not (tmp_path / "screen.yaml.cache.json").exists()
+
+    def test_compile_cache_ignores_other_json_and_stale_sidecars(self, tmp_path):
+        """Test that real .json files are untouched and restored YAML is re-parsed."""
+        import os
+        path = tmp_path / "screen.yaml"
+        path.write_text("screen_id: current\n")
+        other = tmp_path / "screen.json"
+        other.write_text('{"screen_id": "unrelated"}')
+        os.utime(other, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+
+        loader = TemplateLoader(str(tmp_path), compile_cache=True)
+        assert loader.load(str(path))["screen_id"] == "current"
+        assert json.loads(other.read_text()) == {"screen_id": "unrelated"}
+
+        # Restore an older file with an older mtime, as cp -p or tar would
+        old_mtime = path.stat().st_mtime_ns - 10**9
+        path.write_text("screen_id: restored\n")
+        os.utime(path, ns=(old_mtime, old_mtime))
+        assert loader.load(str(path))["screen_id"] == "restored"
+
+    def test_load_all_parallel_skips_broken_files(self, tmp_path):
+        """Test that load_all loads many files and skips unparsable ones."""
+        for i in range(8):
+            (tmp_path / f"screen_{i}.yaml").write_text(f"screen_id: screen_{i}\n")
+        (tmp_path / "broken.yaml").write_text("screen_id: [unclosed\n")
+
+        templates = TemplateLoader(str(tmp_path)).load_all()
+        assert sorted(templates) == [f"screen_{i}" for i in range(8)]
+
 
 class TestTemplateValidator:
     """Test TemplateValidator functionality."""
@@ -68,6 +141,26 @@ class TestTemplateValidator:
         result = validator.validate(template)
         assert isinstance(result, bool)
     
+    def test_each_typed_field_rejects_wrong_type(self):
+        """Test that every typed field is checked when present."""
+        validator = TemplateValidator()
+        assert not validator.validate({"screen_id": 42})
+        assert not validator.validate({"screen_id": "s", "required_nodes": "a"})
+        assert not validator.validate({"screen_id": "s", "structure_signature": 1})
+        assert not validator.validate({"screen_id": "s", "valid_transitions": "a -> b"})
+
+    def test_validate_multiple_notices_in_place_edits(self):
+        """Test that memoized results are invalidated by template mutation."""
+        validator = TemplateValidator()
+        template = {"screen_id": "a", "valid_transitions": ["a -> b"]}
+        templates = {"a": template}
+
+        assert validator.validate_multiple(templates) == {"a": True}
+        assert validator.validate_multiple(templates) == {"a": True}
+
+        template["valid_transitions"].append(3)
+        assert validator.validate_multiple(templates) == {"a": False}
+
     def test_minimal_valid_template(self):
         """Test that screen_id alone is sufficient."""
         validator = TemplateValidator()
@@ -107,3 +200,15 @@ class TestStateMachine:
         sm.transition("screen_b", "screen_c")
         # Should have history
         assert hasattr(sm, 'history') or hasattr(sm, 'state_history')
+
+    def test_history_is_bounded(self):
+        """Test that history keeps only the newest transitions."""
+        sm = StateMachine(history_limit=3)
+        for i in range(5):
+            sm.transition(f"s{i}", f"s{i + 1}")
+
+        assert sm.get_history(10) == [("s2", "s3"), ("s3", "s4"), ("s4", "s5")]
+        assert sm.get_history(1) == [("s4", "s5")]
+
+        sm.set_history_limit(2)
+        assert list(sm.history) == [("s3", "s4"), ("s4", "s5")]
@@ -1,7 +1,10 @@
 """Comprehensive tests for drift detection - Matcher and DiffEngine."""
 import pytest
 import copy
-from core.drift import Matcher, DiffEngine, DriftEvent
+from core.drift import (
+    Matcher, DiffEngine, DriftEvent, Change, FlatTree, StringInterner, TransitionChecker,
+    Severity, normalize_template
+)
 from core.normalization import TreeNormalizer, SignatureGenerator
 from tests.fixtures.mock_trees import (
     DISCORD_CHAT_TREE,
@@ -184,7 +187,25 @@ class TestMatcher:
         score = matcher._check_roles(tree, template)
         # Should be between 0 and 1
         assert 0.0 < score < 1.0
-    
+
+    def test_normalized_template_scores_the_same(self):
+        """Verify pre-indexed templates score like the raw ones without mutating them."""
+        normalizer = TreeNormalizer()
+        matcher = Matcher()
+        tree = normalizer.normalize(DISCORD_CHAT_TREE)
+        template = {
+            "required_nodes": ["message_list", "input_box", "missing_node"],
+            "expected_roles": ["window", "button", "nonexistent_role"],
+        }
+
+        prepared = normalize_template(template)
+
+        assert prepared["_required_nodes_set"] == frozenset(template["required_nodes"])
+        assert "_expected_roles_set" not in template
+        assert matcher.similarity_score(tree, prepared) == matcher.similarity_score(tree, template)
+        # Duplicate required nodes keep the list-based weighting
+        assert "_required_nodes_set" not in normalize_template({"required_nodes": ["a", "a"]})
+
     def test_find_best_match_with_multiple_templates(self):
         """Verify find_best_match returns highest scoring template."""
         normalizer = TreeNormalizer()
@@ -234,7 +255,112 @@ class TestMatcher:
         
         result = matcher.find_best_match(tree, [])
         assert result is None
-    
+
+    def test_find_best_match_walks_tree_once(self, monkeypatch):
+        """Verify tree metrics are shared across all candidate templates."""
+        normalizer = TreeNormalizer()
+        matcher = Matcher(similarity_threshold=0.5)
+        tree = normalizer.normalize(DISCORD_CHAT_TREE)
+        templates = [discord_chat_template(), doordash_offer_template(), gmail_inbox_template()]
+        expected = max(matcher.similarity_score(tree, t) for t in templates)
+
+        walks = []
+        original = matcher._tree_stats
+        monkeypatch.setattr(matcher, "_tree_stats", lambda t: walks.append(t) or original(t))
+        best_template, score = matcher.find_best_match(tree, templates)
+
+        assert len(walks) == 1
+        assert score == expected
+        assert best_template["screen_id"] == discord_chat_template()["screen_id"]
+
+    def test_cached_tree_stats_reused_across_calls(self, monkeypatch):
+        """Verify an opted-in matcher walks a repeatedly scored tree once."""
+        normalizer = TreeNormalizer()
+        matcher = Matcher(similarity_threshold=0.5, cache_tree_stats=True)
+        tree = normalizer.normalize(DISCORD_CHAT_TREE)
+        templates = [discord_chat_template(), doordash_offer_template()]
+        expected = Matcher(similarity_threshold=0.5).find_best_match(tree, templates)
+
+        walks = []
+        original = matcher._walk
+        monkeypatch.setattr(matcher, "_walk", lambda root: walks.append(root) or original(root))
+        for _ in range(3):
+            assert matcher.find_best_match(tree, templates) == expected
+            assert matcher.match(tree, templates[0])
+
+        assert len(walks) == 1
+        matcher.find_best_match(normalizer.normalize(DISCORD_CHAT_TREE), templates)
+        assert len(walks) == 2
+
+    def test_cached_matches_skip_template_sweep(self, monkeypatch):
+        """Verify recurring tree signatures reuse the remembered best match."""
+        normalizer = TreeNormalizer()
+        matcher = Matcher(similarity_threshold=0.5, cache_matches=True)
+        templates = [discord_chat_template(), doordash_offer_template()]
+        expected = Matcher(similarity_threshold=0.5).find_best_match(
+            normalizer.normalize(DISCORD_CHAT_TREE), templates)
+
+        scored = []
+        original = matcher._score_against_template
+        monkeypatch.setattr(matcher, "_score_against_template",
+                            lambda *args: scored.append(args) or original(*args))
+        for _ in range(3):
+            # Fresh but identical captures share a signature
+            assert matcher.find_best_match(normalizer.normalize(DISCORD_CHAT_TREE), templates) == expected
+        assert len(scored) == len(templates)
+
+        matcher.find_best_match(normalizer.normalize(DISCORD_CHAT_TREE), templates[::-1])
+        assert len(scored) == 2 * len(templates)
+        matcher.similarity_threshold = 1.1
+        assert matcher.find_best_match(normalizer.normalize(DISCORD_CHAT_TREE), templates) is None
+        assert len(scored) == 2 * len(templates)
+
+    def test_score_matrix_matches_pairwise_scores(self):
+        """Verify batch scoring equals per-pair similarity_score."""
+        normalizer = TreeNormalizer()
+        matcher = Matcher(similarity_threshold=0.5)
+        trees = [normalizer.normalize(t) for t in (DISCORD_CHAT_TREE, DOORDASH_OFFER_TREE,
+                                                   GMAIL_INBOX_TREE)]
+        templates = [discord_chat_template(), doordash_offer_template(),
+                     normalize_template(gmail_inbox_template()), {"required_nodes": ["x", "x"]}]
+
+        scores = matcher.score_matrix(trees, templates)
+
+        for i, tree in enumerate(trees):
+            for j, template in enumerate(templates):
+                assert scores[i][j] == matcher.similarity_score(tree, template)
+        assert matcher.find_best_matches(trees, templates) == [
+            matcher.find_best_match(tree, templates) for tree in trees]
+
+    def test_find_best_matches_returns_caller_templates(self):
+        """Verify batch matching indexes templates internally but returns the originals."""
+        import json
+        normalizer = TreeNormalizer()
+        matcher = Matcher(similarity_threshold=0.5)
+        templates = [{}, discord_chat_template(), doordash_offer_template()]
+
+        matches = matcher.find_best_matches([normalizer.normalize(DISCORD_CHAT_TREE)], templates)
+
+        assert matches[0][0] is templates[1]
+        assert "_required_nodes_set" not in templates[1]
+        json.dumps(matches[0][0])
+        assert matcher.score_matrix([normalizer.normalize(DISCORD_CHAT_TREE)], templates)[0][0] == 0.0
+
+    def test_similarity_score_early_exit(self, monkeypatch):
+        """Verify scoring stops once the threshold is out of reach."""
+        normalizer = TreeNormalizer()
+        matcher = Matcher()
+        tree = normalizer.normalize(DISCORD_CHAT_TREE)
+        template = {"required_nodes": ["nonexistent1", "nonexistent2"], "expected_roles": ["window"]}
+        exact = matcher.similarity_score(tree, template)
+
+        monkeypatch.setattr(matcher, "_check_structure",
+                            lambda *args: pytest.fail("structure scored after early exit"))
+        bound = matcher.similarity_score(tree, template, early_exit_threshold=0.8)
+
+        assert exact <= bound < 0.8
+        assert not matcher.match(tree, template)
+
     def test_extract_node_names_recursive(self):
         """Verify _extract_node_names finds all nodes recursively."""
         normalizer = TreeNormalizer()
@@ -293,6 +419,25 @@ class TestMatcher:
         # Should count root + all descendants
         assert count > 10
 
+    def test_tree_stats_single_walk_handles_deep_trees(self):
+        """Verify fused tree metrics work past the recursion limit."""
+        import sys
+        matcher = Matcher()
+        root = node = {"role": "panel", "name": "n0"}
+        for i in range(1, sys.getrecursionlimit() + 100):
+            child = {"role": "button" if i % 2 else "panel", "name": f"n{i}"}
+            node["children"] = [child]
+            node = child
+
+        stats = matcher._tree_stats({"root": root})
+
+        assert stats.depth == sys.getrecursionlimit() + 99
+        assert matcher._calculate_depth(root) == stats.depth
+        assert stats.count == sys.getrecursionlimit() + 100
+        assert stats.roles == {"panel", "button"}
+        assert "n0" in stats.names
+        assert matcher.similarity_score({"root": root}, {"required_nodes": ["n5"]}) == 1.0
+
 
 class TestDiffEngine:
     """Test suite for DiffEngine with actual tree deltas."""
@@ -458,6 +603,310 @@ class TestDiffEngine:
         # Should have many differences
         assert (len(result["added"]) + len(result["removed"]) + len(result["modified"])) > 0
 
+    def test_diff_identical_subtrees_count_every_node(self):
+        """Verify pruned identical subtrees still count all their nodes."""
+        engine = DiffEngine()
+        leaf = {"role": "button", "name": "ok", "children": [None, "text"]}
+        tree1 = {"role": "window", "children": [copy.deepcopy(leaf), {"role": "label", "name": "a"}]}
+        tree2 = {"role": "window", "children": [copy.deepcopy(leaf), {"role": "label", "name": "b"}]}
+
+        result = engine.diff(tree1, tree2)
+
+        # window + button subtree (button, None, "text") are unchanged
+        assert result["unchanged"] == 4
+        assert [m["path"] for m in result["modified"]] == ["root[1]"]
+
+    def test_diff_hash_colliding_values_are_compared(self):
+        """Verify subtrees are not pruned just because their values hash alike."""
+        engine = DiffEngine()
+        # hash(-1) == hash(-2) and hash(0) == hash(2**61 - 1) in CPython
+        result = engine.diff({"role": "slider", "value": -1}, {"role": "slider", "value": -2})
+        assert result["modified"][0]["changes"] == {"value": (-1, -2)}
+        assert result["similarity"] < 1.0
+
+        tree1 = {"role": "pane", "children": [{"role": "slider", "value": 0}]}
+        tree2 = {"role": "pane", "children": [{"role": "slider", "value": 2**61 - 1}]}
+        result = engine.diff(tree1, tree2)
+        assert [m["path"] for m in result["modified"]] == ["root[0]"]
+
+    def test_diff_unhashable_values_are_compared(self):
+        """Verify subtrees with unhashable property values are still walked."""
+        engine = DiffEngine()
+        tree1 = {"role": "list", "value": [1, 2], "children": [{"role": "item", "value": [1]}]}
+        tree2 = {"role": "list", "value": [1, 2], "children": [{"role": "item", "value": [2]}]}
+
+        result = engine.diff(tree1, tree2)
+
+        assert result["unchanged"] == 1
+        assert result["modified"][0]["changes"] == {"value": ([1], [2])}
+
+    def test_diff_deep_tree_beyond_recursion_limit(self):
+        """Verify trees deeper than the interpreter recursion limit can be diffed."""
+        import sys
+
+        def chain(leaf_name):
+            root = node = {"role": "pane"}
+            for i in range(sys.getrecursionlimit() + 100):
+                child = {"role": "pane", "name": str(i)}
+                node["children"] = [child]
+                node = child
+            node["name"] = leaf_name
+            return root
+
+        result = DiffEngine().diff(chain("before"), chain("after"))
+
+        assert len(result["modified"]) == 1
+        assert result["modified"][0]["path"].startswith("root[0][0]")
+
+
+    def test_diff_children_none_treated_as_empty(self):
+        """Verify a None children entry diffs like an empty list."""
+        engine = DiffEngine()
+        tree1 = {"role": "pane", "children": None}
+        tree2 = {"role": "pane", "children": [{"role": "button"}]}
+
+        result = engine.diff(tree1, tree2)
+
+        assert result["added"] == [{"path": "root[0]", "node": {"role": "button"}}]
+        assert result["unchanged"] == 1
+
+    def test_diff_insert_at_top_of_long_list(self):
+        """Verify an inserted first child does not shift every later sibling."""
+        engine = DiffEngine()
+        items = [{"role": "listitem", "name": f"item {i}"} for i in range(6)]
+        tree1 = {"role": "list", "children": copy.deepcopy(items)}
+        tree2 = {"role": "list", "children": [{"role": "listitem", "name": "new"}] + copy.deepcopy(items)}
+
+        result = engine.diff(tree1, tree2)
+
+        assert result["added"] == [{"path": "root[0]", "node": {"role": "listitem", "name": "new"}}]
+        assert result["removed"] == []
+        assert result["modified"] == []
+        assert result["unchanged"] == 7
+
+    def test_diff_long_list_rename_is_modification(self):
+        """Verify unmatched siblings between LCS anchors are still paired up."""
+        engine = DiffEngine()
+        items = [{"role": "listitem", "name": f"item {i}"} for i in range(5)]
+        tree1 = {"role": "list", "children": copy.deepcopy(items)}
+        tree2 = {"role": "list", "children": copy.deepcopy(items)}
+        tree2["children"][2]["name"] = "renamed"
+        del tree2["children"][4]
+
+        result = engine.diff(tree1, tree2)
+
+        assert [m["path"] for m in result["modified"]] == ["root[2]"]
+        assert [r["path"] for r in result["removed"]] == ["root[4]"]
+        assert result["added"] == []
+
+    def test_diff_astar_minimal_edits(self):
+        """Verify the A* variant reports a minimal edit script."""
+        engine = DiffEngine()
+        items = [{"role": "listitem", "name": f"item {i}"} for i in range(8)]
+        tree1 = {"role": "list", "children": copy.deepcopy(items)}
+        changed = copy.deepcopy(items)
+        changed[1]["name"] = "renamed"
+        changed.insert(5, {"role": "listitem", "name": "new"})
+        tree2 = {"role": "list", "children": changed}
+
+        result = engine.diff_astar(tree1, tree2)
+
+        assert [m["path"] for m in result["modified"]] == ["root[1]"]
+        assert [a["path"] for a in result["added"]] == ["root[5]"]
+        assert result["removed"] == []
+        assert engine.diff_astar(tree1, copy.deepcopy(tree1)) == engine.diff(tree1, copy.deepcopy(tree1))
+
+    def test_diff_changes_and_events_share_walk(self):
+        """Verify Change and DriftEvent results mirror the dict diff."""
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": [{"role": "button", "name": "ok"}, {"role": "label"}]}
+        tree2 = {"role": "window", "children": [{"role": "button", "name": "go"}]}
+
+        changes = engine.diff_changes(tree1, tree2)
+        assert [str(c) for c in changes] == [
+            "Changed root[0].name: ok -> go",
+            "Missing node at root[1]",
+        ]
+
+        events = engine.diff_events(tree1, tree2, severity="info")
+        assert [(e.change_type, e.location, e.severity) for e in events] == [
+            ("modified", "root[0]", "info"),
+            ("removed", "root[1]", "info"),
+        ]
+        assert events[0].details["changes"] == {"name": ("ok", "go")}
+
+    def test_diff_events_summarize_nodes_on_first_read(self):
+        """Verify events keep node references unless a snapshot is requested."""
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": []}
+        tree2 = {"role": "window", "children": [{"role": "button", "name": "ok", "children": []}]}
+
+        event = engine.diff_events(tree1, tree2)[0]
+        snapshot = engine.diff_events(tree1, tree2, snapshot=True)[0]
+        tree2["children"][0]["name"] = "changed later"
+
+        assert event.to_dict()["details"]["node"] == {"role": "button", "name": "changed later", "type": None}
+        assert snapshot.details["node"] == {"role": "button", "name": "ok", "type": None}
+
+    def test_diff_event_details_are_plain_data(self):
+        """Verify details read directly resolve the node and serialize as JSON."""
+        import json
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": []}
+        tree2 = {"role": "window", "children": [{"role": "button", "name": "ok", "children": []}]}
+
+        event = engine.diff_events(tree1, tree2)[0]
+        assert event.details["node"].get("name") == "ok"
+        assert json.loads(json.dumps(event.details))["node"]["role"] == "button"
+
+        # Resolution is a one-time snapshot that drops the subtree reference
+        tree2["children"][0]["name"] = "changed later"
+        assert event.to_dict()["details"]["node"]["name"] == "ok"
+
+    def test_parallel_diff_matches_sequential(self, monkeypatch):
+        """Verify wide roots diffed in worker processes give the same result."""
+        import core.drift.diff_engine as diff_engine_module
+        monkeypatch.setattr(diff_engine_module, "PARALLEL_THRESHOLD", 2)
+
+        tree1 = {"role": "window", "children": [
+            {"role": "pane", "name": f"p{i}", "children": [{"role": "button", "name": "ok"}]}
+            for i in range(5)]}
+        tree2 = copy.deepcopy(tree1)
+        tree2["children"][1]["children"][0]["name"] = "cancel"
+        tree2["children"].append({"role": "pane", "name": "extra"})
+
+        expected = DiffEngine().diff(tree1, tree2)
+        result = DiffEngine(parallel=True, max_workers=2).diff(tree1, tree2)
+
+        assert result == expected
+        assert [m["path"] for m in result["modified"]] == ["root[1][0]"]
+
+    def test_diff_flat_matches_diff_for_same_shape(self):
+        """Verify the columnar path reports the same result as diff()."""
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": [
+            {"role": "button", "name": "ok"}, {"role": "label", "name": "a", "value": [1]}]}
+        tree2 = {"role": "window", "children": [
+            {"role": "button", "name": "ok"}, {"role": "label", "name": "b", "value": [1]}]}
+
+        baseline = FlatTree(tree1)
+        result = engine.diff_flat(baseline, FlatTree(tree2))
+
+        assert result == engine.diff(tree1, tree2)
+        assert [m["path"] for m in result["modified"]] == ["root[1]"]
+
+    def test_diff_flat_with_shared_interner(self):
+        """Verify trees sharing an interner compare keys by id with the same result."""
+        pytest.importorskip("numpy")
+        engine = DiffEngine()
+        interner = StringInterner()
+        items = [{"role": "listitem", "name": f"item {i}"} for i in range(3)]
+        tree1 = {"role": "list", "children": copy.deepcopy(items)}
+        tree2 = {"role": "list", "children": copy.deepcopy(items)}
+        tree2["children"][2]["name"] = "renamed"
+
+        baseline = FlatTree(tree1, interner)
+        live = FlatTree(tree2, interner)
+
+        assert baseline.key_ids["role"].dtype.name == "int32"
+        assert engine.diff_flat(baseline, live) == engine.diff(tree1, tree2)
+
+    def test_diff_flat_similarity_by_interned_role_ids(self):
+        """Verify role/type ids pair nodes exactly like the dict walk."""
+        pytest.importorskip("numpy")
+        engine = DiffEngine()
+        interner = StringInterner()
+        tree1 = {"role": "window", "children": [{"type": "cell"}, {"type": "text"}]}
+        # A missing role matches an empty one; differing role and type do not
+        tree2 = {"role": "window", "children": [{"role": "", "name": "OK"}, {"role": "img"}]}
+
+        baseline = FlatTree(tree1, interner)
+        live = FlatTree(tree2, interner)
+
+        assert baseline.similar_ids["type"].dtype.name == "int32"
+        result = engine.diff_flat(baseline, live)
+        assert result == engine.diff(tree1, tree2)
+        assert [m["path"] for m in result["modified"]] == ["root[0]"]
+        assert [r["path"] for r in result["removed"]] == ["root[1]"]
+
+    def test_diff_flat_falls_back_on_shape_mismatch(self):
+        """Verify differently shaped trees go through the dict walk."""
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": [{"role": "button"}]}
+        tree2 = {"role": "window", "children": [{"role": "button"}, {"role": "label"}]}
+
+        result = engine.diff_flat(FlatTree(tree1), FlatTree(tree2))
+
+        assert result == engine.diff(tree1, tree2)
+        assert result["added"][0]["path"] == "root[1]"
+
+    def test_max_depth_reports_truncated_subtrees(self):
+        """Verify nodes below max_depth are not compared but reported once."""
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": [
+            {"role": "panel", "children": [{"role": "button", "name": "OK"}]},
+            {"role": "label", "name": "Title"},
+        ]}
+        tree2 = {"role": "window", "children": [
+            {"role": "panel", "children": [{"role": "button", "name": "Cancel"}]},
+            {"role": "label", "name": "Heading"},
+        ]}
+
+        result = engine.diff(tree1, tree2, max_depth=1)
+        assert [m["path"] for m in result["modified"]] == ["root[1]"]
+        assert result["truncated"] == ["root[0]"]
+        assert "truncated" not in engine.diff(tree1, tree2)
+
+        changes = engine.diff_changes(tree1, tree2, max_depth=1)
+        assert [(c.change_type, c.path) for c in changes] == [
+            ("depth_exceeded", "root[0]"), ("changed", "root[1].name")]
+        assert str(changes[0]) == "Depth limit exceeded at root[0]"
+
+        events = engine.diff_events(tree1, tree2, max_depth=0)
+        assert [(e.change_type, e.location) for e in events] == [("depth_exceeded", "root")]
+
+    def test_diff_iter_yields_change_tuples(self):
+        """Verify diff_iter yields plain tuples in Change field order."""
+        engine = DiffEngine()
+        tree1 = {"role": "window", "children": [{"role": "button", "name": "OK"}]}
+        tree2 = {"role": "window", "children": [{"role": "button", "name": "Cancel"},
+                                                {"role": "label"}]}
+
+        records = list(engine.diff_iter(tree1, tree2))
+
+        assert all(type(record) is tuple for record in records)
+        assert records[0] == ("changed", "root[0].name", "OK", "Cancel", tree2["children"][0])
+        assert [Change(*record) for record in records] == engine.diff_changes(tree1, tree2)
+
+    def test_diff_iter_is_lazy(self, monkeypatch):
+        """Verify diff_iter stops comparing when the consumer stops iterating."""
+        from core.drift import _diff_walk
+        compared = []
+        original = _diff_walk.collect_property_changes
+
+        def counting(a, b):
+            compared.append(a)
+            return original(a, b)
+
+        monkeypatch.setattr(_diff_walk, "collect_property_changes", counting)
+        engine = DiffEngine()
+        tree1 = {"role": "list", "children": [{"role": "item", "value": i} for i in range(50)]}
+        tree2 = {"role": "list", "children": [{"role": "item", "value": -i} for i in range(50)]}
+
+        records = engine.diff_iter(tree1, tree2)
+        assert next(records)[:2] == ("changed", "root[1].value")
+        assert len(compared) == 2  # root and root[1]; root[0] is digest-identical
+
+    def test_has_significant_changes_stream(self):
+        """Verify the streaming check compares the change count to the threshold."""
+        engine = DiffEngine()
+        tree1 = {"role": "list", "children": [{"role": "item", "value": i} for i in range(5)]}
+        tree2 = {"role": "list", "children": [{"role": "item", "value": -i} for i in range(5)]}
+
+        # value 0 is unchanged, the other four items change
+        assert engine.has_significant_changes_stream(tree1, tree2, threshold=3)
+        assert not engine.has_significant_changes_stream(tree1, tree2, threshold=4)
+        assert not engine.has_significant_changes_stream(tree1, tree1, threshold=0)
 
 class TestDriftEvent:
     """Test suite for DriftEvent data structure."""
@@ -480,3 +929,138 @@ class TestDriftEvent:
         assert event_dict["severity"] == "critical"
         assert event_dict["details"]["key"] == "value"
         assert "timestamp" in event_dict
+
+    def test_event_ids_are_distinct_16_hex(self):
+        """Verify ids stay 16 hex chars and differ within one clock tick."""
+        events = [DriftEvent("layout", "info", {}) for _ in range(100)]
+        ids = {event.event_id for event in events}
+
+        assert len(ids) == 100
+        assert all(len(event_id) == 16 and int(event_id, 16) >= 0 for event_id in ids)
+
+    def test_to_dict_is_cached_but_caller_owned(self):
+        """Verify repeated serialization reuses the built dict without sharing it."""
+        event = DriftEvent("layout", "critical", {"screen_id": "a"}, location="root")
+
+        first = event.to_dict()
+        first["entry_id"] = "evt_1"
+        second = event.to_dict()
+
+        assert "entry_id" not in second
+        assert second["details"] is first["details"]
+        assert event.is_critical()
+        assert not hasattr(event, "__dict__")
+
+    def test_severity_level_is_ordered(self):
+        """Verify events expose an ordered level alongside the severity string."""
+        critical = DriftEvent.create_layout_drift("a", 0.5, "")
+        warning = DriftEvent.create_layout_drift("a", 0.8, "")
+        custom = DriftEvent("layout", "custom", {})
+
+        assert critical.level is Severity.CRITICAL and critical.severity == "critical"
+        assert critical.level > warning.level >= Severity.WARNING
+        assert critical.is_critical() and not warning.is_critical()
+        assert custom.level is None and not custom.is_critical()
+
+    def test_get_summary_includes_present_details(self):
+        """Verify the summary lists only the details the event carries."""
+        layout = DriftEvent.create_layout_drift("login", 0.5, "")
+        sequence = DriftEvent("sequence", "warning", {"transition": "a -> b"})
+
+        assert layout.get_summary() == "[CRITICAL] | Drift Type: layout | Screen: login | Similarity: 50.0%"
+        assert sequence.get_summary() == "[WARNING] | Drift Type: sequence | Transition: a -> b"
+
+
+class TestChange:
+    """Test suite for Change records."""
+
+    def test_change_str_per_type(self):
+        """Verify each change type renders its own message."""
+        assert str(Change("missing", "/a")) == "Missing node at /a"
+        assert str(Change("added", "/b")) == "Added node at /b"
+        assert str(Change("changed", "/c", "x", "y")) == "Changed /c: x -> y"
+        assert str(Change("moved", "/d", "/old", "/new")) == "Moved node from /old to /new"
+
+    def test_change_str_unknown_type(self):
+        """Verify unknown change types fall back to a generic message."""
+        assert str(Change("renamed", "/e")) == "renamed at /e"
+
+    def test_change_has_no_instance_dict(self):
+        """Verify Change instances are slotted."""
+        change = Change("added", "/a")
+        assert not hasattr(change, "__dict__")
+        with pytest.raises(AttributeError):
+            change.extra = 1
+
+
+class TestTransitionChecker:
+    """Test suite for TransitionChecker history and loop detection."""
+
+    def test_history_keeps_newest_entries(self):
+        """Verify history evicts the oldest transitions past the limit."""
+        checker = TransitionChecker()
+        for i in range(150):
+            checker.record_transition(f"s{i}", f"s{i + 1}", float(i))
+
+        history = checker.get_transition_history(200)
+        assert len(history) == 100
+        assert history[0] == ("s50", "s51", 50.0)
+        assert checker.get_transition_history(2) == [("s148", "s149", 148.0),
+                                                     ("s149", "s150", 149.0)]
+
+    def test_intern_tables_stay_bounded(self):
+        """Verify unique screen ids do not grow the intern tables without bound."""
+        checker = TransitionChecker()
+        for i in range(5000):
+            checker.record_transition(f"from_{i}", f"to_{i}", float(i))
+            assert len(checker._screen_ids) <= 4 * 100 + 2
+
+        assert len(checker._screen_codes) == len(checker._screen_ids)
+        assert checker.get_transition_history(1) == [("from_4999", "to_4999", 4999.0)]
+        assert checker.get_transition_history(100)[0] == ("from_4900", "to_4900", 4900.0)
+
+    def test_detect_loops_finds_recurring_sequences(self):
+        """Verify repeated screen sequences in the window are reported in order."""
+        checker = TransitionChecker()
+        for i, (src, dst) in enumerate([("a", "b"), ("b", "a"), ("a", "b"), ("b", "a"), ("a", "c")]):
+            checker.record_transition(src, dst, float(i))
+
+        assert checker.detect_loops(window=5) == [["a", "b"], ["a", "b", "a"], ["b", "a"]]
+        assert checker.detect_loops(window=3) == []
+
+    def test_validate_transition_graph_with_parsed_pairs(self):
+        """Verify arrow entries are parsed into screen id pairs for graph errors."""
+        checker = TransitionChecker()
+        templates = {
+            "a": {"screen_id": "a", "valid_transitions": ["a -> b", "a -> zz", "a -> b -> c", "b"]},
+            "b": {"screen_id": "b", "valid_transitions": []},
+        }
+        expected = {"a": ["Transition references unknown screen: zz",
+                          "Invalid transition format: a -> b -> c"]}
+
+        assert checker.validate_transition_graph(templates) == expected
+        from core.drift.transition_checker import parse_transitions
+        assert parse_transitions(templates["a"]["valid_transitions"])[0] == ("a", "b")
+
+    def test_is_allowed_matches_check_transition(self):
+        """Verify the boolean shortcut agrees with the full result."""
+        checker = TransitionChecker()
+        templates = [None, {}, {"screen_id": "a"}, {"screen_id": "a", "valid_transitions": ["b"]}]
+
+        for template in templates:
+            for target in ("b", "x"):
+                expected = checker.check_transition(template or {}, target).is_valid
+                assert checker.is_allowed(template, target) is expected
+
+    def test_detect_forced_flow_reports_screen_ids(self):
+        """Verify interned history decodes back to the recorded screen ids."""
+        checker = TransitionChecker()
+        templates = {screen: {"screen_id": screen, "valid_transitions": [nxt]}
+                     for screen, nxt in [("a", "b"), ("b", "c"), ("c", "d")]}
+        for i, (src, dst) in enumerate([("a", "b"), ("b", "c"), ("c", "d")]):
+            checker.record_transition(src, dst, float(i))
+
+        result = checker.detect_forced_flow(templates)
+        assert result["flow"] == ["a", "b", "c", "d"]
+        templates["b"]["valid_transitions"].append("a")
+        assert checker.detect_forced_flow(templates) is None
@@ -43,6 +43,20 @@ class TestHashChain:
         result = chain.verify_chain(entries)
         assert isinstance(result, tuple)
 
+    def test_link_hash_format_is_stable(self):
+        """Test entry hashes stay SHA256(previous_hash + data + timestamp)."""
+        import hashlib
+        chain = HashChain()
+        previous = chain.current_hash
+        data = {"b": "é", "a": 1}
+
+        entry_hash = chain.add_entry(data, 12.5)
+        expected = hashlib.sha256(
+            f'{previous}{json.dumps(data, sort_keys=True)}12.5'.encode('utf-8')).hexdigest()
+        assert entry_hash == expected
+        assert chain.verify_entry(entry_hash, data, 12.5, previous)
+        assert not chain.verify_entry(entry_hash, data, 12.6, previous)
+
 
 class TestImmutableLog:
     """Test ImmutableLog functionality."""
@@ -145,6 +159,69 @@ class TestImmutableLog:
         finally:
             Path(log_path).unlink(missing_ok=True)
 
+    def test_lookup_by_hash_and_search(self):
+        """Test indexed lookups agree with the entries before and after appends."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+
+        try:
+            log = ImmutableLog(log_path)
+            for i in range(6):
+                log.append({"kind": f"k{i % 3}", "n": i, "tags": [i]})
+            assert log.search(kind="k1") == [log.get_entries()[1], log.get_entries()[4]]
+
+            last = log.append({"kind": "k1", "n": 6, "tags": [6]})
+            assert [e["data"]["n"] for e in log.search(kind="k1")] == [1, 4, 6]
+            assert [e["data"]["n"] for e in log.search(kind="k1", n=4)] == [4]
+            assert [e["data"]["n"] for e in log.search(tags=[2])] == [2]
+            assert log.search(kind="missing") == []
+            assert log.get_entry_by_hash(last)["data"]["n"] == 6
+            assert log.get_entry_by_hash("unknown") is None
+
+            reloaded = ImmutableLog(log_path)
+            entry = reloaded.get_entries()[2]
+            assert reloaded.get_entry_by_hash(entry["entry_hash"]) is entry
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_load_tolerates_unusual_lines(self):
+        """Test that NaN literals, bare arrays and bad JSON lines load like before."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write('{"data": {"x": NaN}, "entry_hash": "h1"}\n')
+            f.write('[1, 2]\n\n')
+            f.write('{"bad json\n')
+            f.write('{"event": "raw"}\n')
+            log_path = f.name
+
+        try:
+            log = ImmutableLog(log_path, verify_on_load=False)
+            entries = log.get_entries()
+            assert len(entries) == 3
+            assert entries[1] == [1, 2]
+            assert entries[2] == {"data": {"event": "raw"}}
+            assert log.hash_chain.current_hash == "h1"
+            assert not log.verify_integrity()
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_get_entries_between(self):
+        """Test time-range queries for ordered and out-of-order timestamps."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+
+        try:
+            log = ImmutableLog(log_path)
+            for ts in (10.0, 20.0, 20.0, 30.0):
+                log.append({"data": "event", "timestamp": ts})
+            assert [e["timestamp"] for e in log.get_entries_between(20.0, 30.0)] == [20.0, 20.0, 30.0]
+            assert log.get_entries_between(31.0, 40.0) == []
+
+            log.append({"data": "late", "timestamp": 15.0})
+            log.append({"data": "no time", "timestamp": "unknown"})
+            assert [e["timestamp"] for e in log.get_entries_between(12.0, 20.0)] == [20.0, 20.0, 15.0]
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
 
 class TestEventWriter:
     """Test EventWriter functionality."""
@@ -183,3 +260,132 @@ class TestEventWriter:
             assert log.verify_integrity()
         finally:
             Path(log_path).unlink(missing_ok=True)
+
+    def test_written_lines_round_trip(self):
+        """Test that non-ASCII text, non-string keys and NaN/inf reload and verify."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+        
+        try:
+            writer = EventWriter(log_path)
+            writer.write({"screen": "café", "similarity": 0.1 + 0.2})
+            writer.write({"counts": {1: "one"}})
+            writer.write({"similarity": float('nan'), "bounds": [float('inf'), -float('inf')], "note": None})
+            writer.close()
+            
+            lines = Path(log_path).read_text(encoding='utf-8').splitlines()
+            assert json.loads(lines[0])["data"]["screen"] == "café"
+            assert json.loads(lines[0])["data"]["similarity"] == 0.1 + 0.2
+            assert json.loads(lines[1])["data"]["counts"] == {"1": "one"}
+            assert json.loads(lines[2])["data"]["bounds"] == [float('inf'), -float('inf')]
+            assert ImmutableLog(log_path).verify_integrity()
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_batched_flush_policy(self):
+        """Test that batched writers flush every N writes and on close."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+        
+        try:
+            writer = EventWriter(log_path, auto_flush=False, flush_every=3)
+            writer.write({"data": "event_0"})
+            writer.write({"data": "event_1"})
+            assert Path(log_path).read_bytes() == b""
+            
+            writer.write({"data": "event_2"})
+            assert len(Path(log_path).read_bytes().splitlines()) == 3
+            
+            assert writer.write_batch([{"data": "event_3"}, {"data": "event_4"}]) == 2
+            writer.close()
+            assert len(Path(log_path).read_bytes().splitlines()) == 5
+            assert ImmutableLog(log_path).verify_integrity()
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_write_batch_logs_bad_events_once(self, caplog):
+        """Test that write_batch skips bad events with one throttled warning."""
+        from core.logging import event_writer
+        event_writer._error_throttle._last_seen.clear()
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+
+        try:
+            writer = EventWriter(log_path)
+            with caplog.at_level("WARNING", logger="core.logging.event_writer"):
+                written = writer.write_batch(
+                    [{"data": "ok"}, {"bad": object()}, {"bad": object()}, {"data": "also_ok"}]
+                )
+            writer.close()
+
+            assert written == 2
+            assert [r.getMessage() for r in caplog.records] == [
+                "EventWriter error: Object of type object is not JSON serializable"
+            ]
+            assert ImmutableLog(log_path).verify_integrity()
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_sync_every_groups_fsyncs(self, monkeypatch):
+        """Test that sync_every issues one fsync per group of writes."""
+        from core.logging import event_writer
+        synced = []
+        monkeypatch.setattr(event_writer, "_fsync", synced.append)
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+        
+        try:
+            writer = EventWriter(log_path, auto_flush=False, sync_every=4)
+            for i in range(6):
+                writer.write({"data": f"event_{i}"})
+            assert len(synced) == 1
+            
+            writer.write_batch([{"data": f"batch_{i}"} for i in range(10)])
+            assert len(synced) == 2
+            writer.close()
+            assert len(Path(log_path).read_bytes().splitlines()) == 16
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_raw_writers_share_one_file(self):
+        """Test that raw writers append whole lines to a shared file."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            log_path = f.name
+
+        try:
+            first = EventWriter(log_path, raw=True)
+            second = EventWriter(log_path, raw=True)
+            for i in range(5):
+                first.write({"data": f"first_{i}"})
+                second.write({"data": f"second_{i}", "padding": "x" * 5000})
+            # Unbuffered: lines are in the file before close
+            lines = Path(log_path).read_bytes().splitlines()
+            first.close()
+            second.close()
+
+            assert len(lines) == 10
+            assert [json.loads(line)["data"]["data"] for line in lines[:2]] == ["first_0", "second_0"]
+        finally:
+            Path(log_path).unlink(missing_ok=True)
+
+    def test_verify_chain_parallel_matches_sequential(self, monkeypatch):
+        """Test that sliced verification reports the same first error."""
+        from core.logging import hash_chain
+        monkeypatch.setattr(hash_chain, "_PARALLEL_MIN_ENTRIES", 4)
+        chain = HashChain()
+        entries = []
+        for i in range(40):
+            prev = chain.current_hash
+            ts = 1000.0 + i
+            entry_hash = chain.add_entry({"data": f"event_{i}"}, ts)
+            entries.append({"entry_hash": entry_hash, "previous_hash": prev,
+                            "timestamp": ts, "data": {"data": f"event_{i}"}})
+        
+        verifier = HashChain()
+        assert verifier.verify_chain_parallel(entries, max_workers=2) == (True, [])
+        
+        entries[25]["data"]["data"] = "TAMPERED"
+        entries[31]["entry_hash"] = None
+        expected = (False, ["Entry 25 hash verification failed"])
+        assert verifier.verify_chain(entries) == expected
+        assert verifier.verify_chain_parallel(entries, max_workers=2) == expected
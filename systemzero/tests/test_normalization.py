@@ -1,8 +1,9 @@
 """Comprehensive tests for tree normalization and signature generation."""
 import pytest
 import hashlib
+import json
 import copy
-from core.normalization import TreeNormalizer, SignatureGenerator
+from core.normalization import TreeNormalizer, SignatureGenerator, NodeClassifier, NoiseFilters
 from tests.fixtures.mock_trees import (
     DISCORD_CHAT_TREE,
     DOORDASH_OFFER_TREE,
@@ -77,13 +78,41 @@ class TestTreeNormalizer:
         root = normalized["root"]
         assert root["name"] == "Main Window"
         assert "title" not in root
-        
+
         assert normalized["root"]["children"][0]["name"] == "Submit"
         assert "label" not in normalized["root"]["children"][0]
-        
+
         assert normalized["root"]["children"][1]["name"] == "Description"
         assert "text" not in normalized["root"]["children"][1]
-    
+
+    def test_normalize_leaves_input_untouched(self):
+        """Verify that the input is unchanged and shares no mutable values with the result."""
+        tree = {
+            "root": {
+                "role": "window",
+                "states": ["active"],
+                "children": [{"role": "button", "label": "OK", "id": 1}]
+            },
+            "meta": {"source": ["uia"]},
+            "timestamp": 1.0
+        }
+        original = copy.deepcopy(tree)
+
+        normalized = TreeNormalizer().normalize(tree)
+        normalized["root"]["states"].append("focused")
+        normalized["meta"]["source"].append("ax")
+
+        assert tree == original
+        assert normalized["root"]["children"] == [{"role": "button", "name": "OK"}]
+
+    def test_normalize_interns_role_and_type(self):
+        """Verify that equal role/type values from separate captures share one string."""
+        normalizer = TreeNormalizer()
+        first = normalizer.normalize({"root": {"role": "".join(["but", "ton"]), "type": "Ctl"}})
+        second = normalizer.normalize({"root": {"role": "".join(["butt", "on"]), "type": "Ctl"}})
+
+        assert first["root"]["role"] is second["root"]["role"]
+
     def test_normalize_sorts_children_deterministically(self):
         """Verify that children are sorted for deterministic comparison."""
         tree_unsorted = {
@@ -400,3 +429,92 @@ class TestSignatureGenerator:
         # Should be SHA256 of empty string
         expected = hashlib.sha256(b"").hexdigest()
         assert empty_sig == expected
+
+    def test_generate_hashes_compact_sorted_json(self):
+        """Verify the signature format stays compatible with stored baselines."""
+        sig_gen = SignatureGenerator()
+
+        tree = {"root": {"role": "button", "name": "Envoyé", "id": 7,
+                         "bounds": {"y": 2, "x": 1}, "tags": ("a", "b"),
+                         "children": [{"role": "text", "value": 0.5, "focused": True}]}}
+        canonical = {"root": {"role": "button", "name": "Envoyé",
+                              "bounds": {"y": 2, "x": 1}, "tags": "('a', 'b')",
+                              "children": [{"role": "text", "value": 0.5}]}}
+        payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+
+        assert sig_gen.generate(tree) == hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TestNodeClassifier:
+    """Test suite for NodeClassifier."""
+
+    def test_classify_by_role(self):
+        """Verify each role family maps to its category, case-insensitively."""
+        classifier = NodeClassifier()
+        expected = {"Button": "interactive", "heading": "content", "tree": "navigation",
+                    "text_field": "input", "scroll_pane": "container"}
+        for role, category in expected.items():
+            assert classifier.classify({"role": role}) == category
+
+    def test_classify_falls_back_to_type_and_properties(self):
+        """Verify nodes with unknown roles use type, name and property hints."""
+        classifier = NodeClassifier()
+        assert classifier.classify({"role": "custom", "type": "push_button"}) == "interactive"
+        assert classifier.classify({"role": "custom", "type": "label"}) == "content"
+        assert classifier.classify({"role": "custom", "properties": {"clickable": True}}) == "interactive"
+        assert classifier.classify({}) == "unknown"
+        assert classifier.classify({"type": "spacer"}) == "decorative"
+
+    def test_get_interactive_nodes_order_and_depth(self):
+        """Verify interactive nodes come back in document order, even from deep trees."""
+        classifier = NodeClassifier()
+        tree = {"role": "window", "children": [
+            {"role": "button", "name": "a", "children": [{"role": "link", "name": "b"}]},
+            "not a node",
+            {"role": "tab", "name": "c"},
+        ]}
+        assert [n["name"] for n in classifier.get_interactive_nodes(tree)] == ["a", "b", "c"]
+
+        deep = node = {"role": "button"}
+        for _ in range(5000):
+            node["children"] = [{"role": "button"}]
+            node = node["children"][0]
+        assert len(classifier.get_interactive_nodes(deep)) == 5001
+
+
+class TestNoiseFilters:
+    """Test suite for NoiseFilters."""
+
+    @staticmethod
+    def _node(role, name, children=None, **properties):
+        node = {"role": role, "name": name, "properties": {"enabled": True, **properties},
+                "bounds": {"width": 10, "height": 10}}
+        if children is not None:
+            node["children"] = children
+        return node
+
+    def test_filter_removes_noise_without_touching_input(self):
+        """Verify noise subtrees are dropped and the input tree is left intact."""
+        tree = {"root": self._node("window", "main", [
+            self._node("button", "send"),
+            self._node("scrollbar", "bar", [self._node("button", "inner")]),
+            self._node("text", "Loading..."),
+            self._node("panel", "hidden", visible=False),
+        ])}
+        original = copy.deepcopy(tree)
+
+        filtered = NoiseFilters().filter(tree)
+
+        assert [c["name"] for c in filtered["root"]["children"]] == ["send"]
+        assert tree == original
+        assert filtered["root"] is not tree["root"]
+
+    def test_noise_names_match_as_literal_substrings(self):
+        """Verify added name patterns match literally, including regex metacharacters."""
+        filters = NoiseFilters()
+        filters.add_noise_name("Ad (sponsored)")
+
+        assert filters._should_filter(self._node("text", "Loading messages"))
+        assert filters._should_filter(self._node("text", "an ad (sponsored) post"))
+        assert not filters._should_filter(self._node("text", "ad sponsored"))
+        assert not filters._should_filter(self._node("text", "Inbox"))
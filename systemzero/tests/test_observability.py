@@ -171,7 +171,20 @@ class TestMetricsCollector:
         assert 48 <= stats["p50"] <= 51  # Median around 50
         assert 93 <= stats["p95"] <= 96  # 95th percentile
         assert 98 <= stats["p99"] <= 100  # 99th percentile
-    
+
+    def test_histogram_keeps_most_recent_observations(self, setup):
+        """Test that histograms drop the oldest observations past the limit."""
+        collector = setup
+        collector._HISTOGRAM_LIMIT = 10
+
+        for i in range(25):
+            collector.observe_histogram("window", float(i))
+
+        stats = collector.get_metrics()["histograms"]["window"]
+        assert stats["count"] == 10
+        assert stats["min"] == 15.0
+        assert stats["max"] == 24.0
+
     def test_set_gauge(self, setup):
         """Test setting gauge values."""
         collector = setup
@@ -305,6 +318,19 @@ class TestHealthChecker:
         if broken_results:
             assert broken_results[0]["status"] == "unhealthy"
 
+    def test_run_shares_one_timestamp(self):
+        """Test that a run stamps failures and the summary with one time."""
+        checker = HealthChecker()
+
+        def broken_check():
+            raise Exception("Intentional error")
+
+        checker.register_check(broken_check)
+        result = checker.run_checks()
+
+        broken = [c for c in result["checks"] if c["name"] == "broken_check"]
+        assert broken[0]["timestamp"] == result["timestamp"]
+
 
 class TestMetricsIntegration:
     """Test metrics integration."""
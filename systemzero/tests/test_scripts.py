@@ -0,0 +1,55 @@
+"""Tests for the Locust CSV parsers in the top-level scripts directory."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+
+STATS_CSV = (
+    "Type,Name,Request Count,Count,Average,Min,Max,Median,95%,Failure Rate\n"
+    "GET,/b,10,10,12.5,1,40,11,30,0.0\n"
+    "POST,/a,4,4,20,5,50,18,45,25%\n"
+    "GET,/b,12,12,14.0,2,42,13,33,1.5\n"
+    ",Aggregated,26,26,15,1,50,13,40,0\n"
+)
+
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("script, parser", [
+    ("compare_baselines", "parse_locust_csv"),
+    ("parse_locust_metrics", "parse_stats"),
+])
+class TestLocustCsvParsers:
+    """Test that the pandas and csv.DictReader paths agree."""
+
+    def _parse_both(self, script, parser, path, monkeypatch):
+        module = _load_script(script)
+        if module.pd is None:
+            pytest.skip("pandas is not installed")
+        fast = getattr(module, parser)(path)
+        monkeypatch.setattr(module, "pd", None)
+        return fast, getattr(module, parser)(path)
+
+    def test_paths_agree_on_duplicates(self, script, parser, tmp_path, monkeypatch):
+        """Test that duplicate endpoints keep first-seen order and last values."""
+        path = tmp_path / "stats.csv"
+        path.write_text(STATS_CSV.replace("25%", "25") if script == "parse_locust_metrics" else STATS_CSV)
+
+        fast, rows = self._parse_both(script, parser, path, monkeypatch)
+        assert fast == rows
+        assert list(fast)[:2] == list(rows)[:2] == ["/b (GET)", "/a (POST)"]
+        assert fast["/b (GET)"]["count"] == 12
+
+    def test_paths_agree_on_empty_file(self, script, parser, tmp_path, monkeypatch):
+        """Test that an empty stats file parses to no endpoints."""
+        path = tmp_path / "stats.csv"
+        path.write_text("")
+
+        assert self._parse_both(script, parser, path, monkeypatch) == ({}, {})